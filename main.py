@@ -177,7 +177,8 @@ async def generate_single_story(theme: str, language: str = "zh"):
             audio_file=main_audio_file,
             subtitle_file=saved_subtitle_path,
             output_path=str(output_video),
-            audio_duration=full_audio_obj.duration_seconds if full_audio_obj else None
+            audio_duration=full_audio_obj.duration_seconds if full_audio_obj else None,
+            subtitle_segments=all_subtitle_segments or None  # 直接使用对齐结果，跳过SRT重新解析
         )
         
         # 输出完成信息（使用服务类）
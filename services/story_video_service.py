@@ -277,7 +277,8 @@ class StoryVideoService:
                                 audio_file: Optional[str] = None,
                                 subtitle_file: Optional[str] = None,
                                 output_path: str = None,
-                                audio_duration: Optional[float] = None) -> Optional[str]:
+                                audio_duration: Optional[float] = None,
+                                subtitle_segments=None) -> Optional[str]:
         """
         合成最终视频 - 支持一体化模式（角色图像+场景视频）
         
@@ -290,6 +291,7 @@ class StoryVideoService:
             subtitle_file: 字幕文件路径
             output_path: 输出视频路径
             audio_duration: 音频时长
+            subtitle_segments: 内存中的字幕段落（传入时跳过SRT重新解析）
             
         Returns:
             Optional[str]: 成功时返回视频文件路径，失败时返回None
@@ -308,6 +310,7 @@ class StoryVideoService:
                 subtitle_file=str(subtitle_file) if subtitle_file else None,
                 output_path=str(output_path),
                 audio_duration=audio_duration,
+                subtitle_segments=subtitle_segments,
                 use_jianying_style=True,  # 🎬 启用剪映风格字幕
                 integrated_mode=bool(scene_videos)  # 标识是否为一体化模式
             )
@@ -0,0 +1,113 @@
+"""
+SubtitleEngine单元测试
+测试剪映风格ASS脚本生成
+"""
+import pytest
+from unittest.mock import Mock
+
+from video.subtitle_engine import SubtitleEngine, SubtitleSegment, SubtitleStyle
+
+
+class TestAssColor:
+    """ASS颜色转换测试类"""
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("color,expected", [
+        ("white", "&H00FFFFFF"),
+        ("Black", "&H00000000"),
+        ("#FF8800", "&H000088FF"),
+        ("#ff8800", "&H000088FF"),
+        ("black@0.7", "&H4D000000"),
+        ("#FF0000@0.5", "&H800000FF"),
+        ("#12345", "&H00FFFFFF"),
+        ("yellow", "&H0000FFFF"),
+        ("Orange@0.5", "&H8000A5FF"),
+        ("0xFF8800", "&H000088FF"),
+        ("notacolor", "&H00FFFFFF"),
+        ("black@x", "&H00000000"),
+    ])
+    def test_to_ass_color(self, color, expected):
+        """测试FFmpeg颜色名称、十六进制及带透明度的颜色（&HAABBGGRR，无效颜色回退为白色，无效透明度回退为不透明）"""
+        assert SubtitleEngine._to_ass_color(color) == expected
+
+
+class TestFilterArgEscape:
+    """FFmpeg滤镜参数转义测试类"""
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value,expected", [
+        ("/tmp/output/temp/jianying_1.ass", "/tmp/output/temp/jianying_1.ass"),
+        ("C:\\fonts", "C\\\\:\\\\\\\\fonts"),
+        ("/tmp/it's.ass", "/tmp/it\\\\\\'s.ass"),
+        ("/tmp/a[1],b;c.ass", "/tmp/a\\[1\\]\\,b\\;c.ass"),
+    ])
+    def test_escape_filter_arg(self, value, expected):
+        """测试路径中的反斜杠、单引号、冒号及滤镜图分隔符被转义（选项值与滤镜图两级）"""
+        assert SubtitleEngine._escape_filter_arg(value) == expected
+
+
+class TestJianyingAss:
+    """剪映风格ASS脚本测试类"""
+    
+    @pytest.fixture
+    def engine(self):
+        engine = SubtitleEngine.__new__(SubtitleEngine)
+        engine.config = Mock()
+        engine.config.get_video_config.return_value.resolution = "720x1280"
+        return engine
+    
+    @pytest.fixture
+    def segments(self):
+        return [
+            SubtitleSegment(text="第一句", start_time=0.0, end_time=1.5, duration=1.5),
+            SubtitleSegment(text="{第二句}", start_time=1.5, end_time=3.0, duration=1.5),
+        ]
+    
+    @staticmethod
+    def _style(**overrides):
+        options = dict(name="main", font_size=48, font_color="#FFFFFF",
+                       border_color="#000000", border_width=3)
+        options.update(overrides)
+        return SubtitleStyle(**options)
+    
+    @staticmethod
+    def _dialogues(script):
+        return [line for line in script.splitlines() if line.startswith("Dialogue:")]
+    
+    @pytest.mark.unit
+    def test_box_layer_and_fade(self, engine, segments):
+        """测试背景框层与\\fad淡入淡出标签"""
+        style = self._style(background_enabled=True, background_color="black@0.7",
+                            fade_enabled=True, fade_duration=0.2)
+        
+        script = engine._generate_jianying_ass(segments, style, None, 5.0)
+        
+        assert "PlayResX: 720\nPlayResY: 1280" in script
+        assert "Style: Text,Arial,48,&H00FFFFFF,&H000000FF,&H00000000," in script
+        assert "Style: Box,Arial,48,&HFF000000,&H000000FF,&H4D000000," in script
+        # 每段字幕先写背景框层(Layer 0)，再写文字层(Layer 1)；最后一段延伸到 final_end
+        assert self._dialogues(script) == [
+            "Dialogue: 0,0:00:00.00,0:00:01.50,Box,,0,0,0,,{\\fad(200,200)}第一句",
+            "Dialogue: 1,0:00:00.00,0:00:01.50,Text,,0,0,0,,{\\fad(200,200)}第一句",
+            "Dialogue: 0,0:00:01.50,0:00:05.00,Box,,0,0,0,,{\\fad(200,200)}｛第二句｝",
+            "Dialogue: 1,0:00:01.50,0:00:05.00,Text,,0,0,0,,{\\fad(200,200)}｛第二句｝",
+        ]
+    
+    @pytest.mark.unit
+    def test_without_box_and_fade(self, engine, segments):
+        """测试未启用背景框和淡入淡出时只输出文字层"""
+        script = engine._generate_jianying_ass(segments, self._style(), None, 3.0)
+        
+        assert "Style: Box" not in script
+        assert self._dialogues(script) == [
+            "Dialogue: 1,0:00:00.00,0:00:01.50,Text,,0,0,0,,第一句",
+            "Dialogue: 1,0:00:01.50,0:00:03.00,Text,,0,0,0,,｛第二句｝",
+        ]
+    
+    @pytest.mark.unit
+    def test_font_family_from_font_path(self, engine, segments):
+        """测试根据字体文件名推断ASS字体族"""
+        script = engine._generate_jianying_ass(
+            segments, self._style(), "/usr/share/fonts/noto/NotoSansCJK-Regular.ttc", 3.0)
+        
+        assert "Style: Text,Noto Sans CJK SC,48," in script
@@ -0,0 +1,85 @@
+"""
+SubtitleProcessor单元测试
+测试字幕时间分配
+"""
+import random
+import pytest
+from unittest.mock import Mock
+
+from video.subtitle_processor import SubtitleProcessor
+
+
+def _reference_timing(text_segments, total_duration):
+    """逐段累加的原始时间分配实现（对照用）"""
+    total_length = sum(len(segment) for segment in text_segments)
+    current_time = 0.0
+    timings = []
+    
+    for i, text in enumerate(text_segments):
+        if total_length > 0:
+            segment_duration = (len(text) / total_length) * total_duration
+        else:
+            segment_duration = total_duration / len(text_segments)
+        
+        if i == len(text_segments) - 1:
+            end_time = total_duration
+        else:
+            end_time = current_time + segment_duration
+        
+        timings.append((current_time, end_time))
+        current_time = end_time
+    
+    return timings
+
+
+class TestAssignTiming:
+    """字幕时间分配测试类"""
+    
+    @pytest.fixture
+    def processor(self):
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: default
+        return SubtitleProcessor(config, Mock())
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text_segments,total_duration", [
+        (["第一句", "第二句更长一些", "三"], 10.0),
+        (["only one"], 3.3),
+        (["", "", ""], 4.5),
+        (["a", "", "bbb"], 7.0),
+    ])
+    def test_matches_reference_loop(self, processor, text_segments, total_duration):
+        """测试与逐段累加实现的开始/结束时间一致"""
+        segments = processor._assign_timing(text_segments, total_duration)
+        expected = _reference_timing(text_segments, total_duration)
+        
+        assert [segment.text for segment in segments] == text_segments
+        assert [(s.start_time, s.end_time) for s in segments] == [
+            pytest.approx(timing, abs=1e-9) for timing in expected
+        ]
+    
+    @pytest.mark.unit
+    def test_matches_reference_loop_random(self, processor):
+        """测试随机输入下与逐段累加实现一致，且片段首尾相接"""
+        rng = random.Random(62)
+        
+        for _ in range(500):
+            text_segments = ['x' * rng.randint(0, 40) for _ in range(rng.randint(1, 30))]
+            total_duration = rng.uniform(0.1, 600.0)
+            
+            segments = processor._assign_timing(text_segments, total_duration)
+            expected = _reference_timing(text_segments, total_duration)
+            
+            for segment, (start_time, end_time) in zip(segments, expected):
+                assert segment.start_time == pytest.approx(start_time, abs=1e-9)
+                assert segment.end_time == pytest.approx(end_time, abs=1e-9)
+                assert segment.duration == pytest.approx(end_time - start_time, abs=1e-9)
+            
+            assert segments[0].start_time == 0.0
+            assert segments[-1].end_time == total_duration
+            assert all(a.end_time == b.start_time for a, b in zip(segments, segments[1:]))
+    
+    @pytest.mark.unit
+    def test_empty_input(self, processor):
+        """测试空输入"""
+        assert processor._assign_timing([], 5.0) == []
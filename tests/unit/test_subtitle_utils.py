@@ -0,0 +1,78 @@
+"""
+SubtitleUtils单元测试
+测试英文/西班牙文按单词换行
+"""
+import random
+import re
+import pytest
+
+from utils.subtitle_utils import SubtitleUtils
+
+
+def _reference_split(text, max_length, pattern):
+    """逐词拼接的原始换行实现（对照用）"""
+    sentences = re.split(pattern, text)
+    lines = []
+    
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        
+        words = sentence.split()
+        current_line = ""
+        
+        for word in words:
+            if len(current_line + " " + word) <= max_length:
+                current_line += (" " + word) if current_line else word
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
+        
+        if current_line:
+            lines.append(current_line)
+    
+    return [line for line in lines if line.strip()]
+
+
+def _random_text(rng):
+    """随机文本：长短单词、标点、连字符及各种空白"""
+    pieces = []
+    for _ in range(rng.randint(0, 40)):
+        word = ''.join(rng.choice("abcdefghijklmnñáé-'") for _ in range(rng.randint(1, 30)))
+        pieces.append(word)
+        pieces.append(rng.choice([" ", " ", " ", "  ", "\t", "\n", ". ", "! ", "? ", "¿", "¡", ", "]))
+    return rng.choice(["", " ", "\t"]) + ''.join(pieces)
+
+
+class TestWrapWords:
+    """按单词换行测试类"""
+    
+    @pytest.mark.unit
+    def test_long_word_kept_whole(self):
+        """测试超长单词单独成行且不截断"""
+        lines = SubtitleUtils._split_english_text("a supercalifragilistic word", 10)
+        
+        assert lines == ["a", "supercalifragilistic", "word"]
+    
+    @pytest.mark.unit
+    def test_hyphenated_words_not_broken(self):
+        """测试连字符单词不在连字符处断开"""
+        lines = SubtitleUtils._split_english_text("well-known state-of-the-art", 12)
+        
+        assert lines == ["well-known", "state-of-the-art"]
+    
+    @pytest.mark.unit
+    def test_matches_reference_splitter(self):
+        """测试2万个随机输入下与逐词拼接实现的输出完全一致"""
+        rng = random.Random(61)
+        
+        for _ in range(20000):
+            text = _random_text(rng)
+            max_length = rng.randint(1, 40)
+            
+            assert SubtitleUtils._split_english_text(text, max_length) == \
+                _reference_split(text, max_length, r'[.!?]'), (text, max_length)
+            assert SubtitleUtils._split_spanish_text(text, max_length) == \
+                _reference_split(text, max_length, r'[.!?¡¿]'), (text, max_length)
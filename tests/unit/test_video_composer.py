@@ -0,0 +1,400 @@
+"""
+VideoComposer单元测试
+测试SRT解析等不依赖FFmpeg的辅助方法
+"""
+import os
+import asyncio
+import logging
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from video.video_composer import VideoComposer, _probe_encoders, _probe_filters
+
+
+class TestSrtBlockScanner:
+    """SRT逐行扫描测试类"""
+    
+    @staticmethod
+    def _blocks(content):
+        return list(VideoComposer._iter_srt_blocks(content.splitlines(keepends=True)))
+    
+    @pytest.mark.unit
+    def test_multi_line_cues(self):
+        """测试多行字幕文本"""
+        content = (
+            "1\n00:00:00,000 --> 00:00:01,500\n第一行\n第二行\n\n"
+            "2\n00:00:01,500 --> 00:00:03,000\nsingle\n"
+        )
+        
+        assert self._blocks(content) == [
+            ("00:00:00,000 --> 00:00:01,500", ["第一行", "第二行"]),
+            ("00:00:01,500 --> 00:00:03,000", ["single"]),
+        ]
+    
+    @pytest.mark.unit
+    def test_crlf_and_extra_blank_lines(self):
+        """测试CRLF换行及字幕块之间的多余空行"""
+        content = (
+            "1\r\n00:00:00,000 --> 00:00:01,000\r\nA\r\n\r\n\r\n\r\n"
+            "2\r\n00:00:01,000 --> 00:00:02,000\r\nB\r\n\r\n"
+        )
+        
+        assert self._blocks(content) == [
+            ("00:00:00,000 --> 00:00:01,000", ["A"]),
+            ("00:00:01,000 --> 00:00:02,000", ["B"]),
+        ]
+    
+    @pytest.mark.unit
+    def test_malformed_blocks(self, tmp_path):
+        """测试缺少时间轴、时间码无效或缺少文本的字幕块"""
+        content = (
+            "1\nno timing here\n\n"
+            "2\n00:00:01,000 --> 00:00:02,000\n\n"
+            "3\n00:00:02,000 --> bogus\nB\n\n"
+            "4\n00:00:02,000 --> 00:00:03,000\nC"
+        )
+        
+        # 没有时间轴的块被跳过；空文本块和无效时间码块照常产出，由调用方丢弃；末尾无空行的块也会提交
+        assert self._blocks(content) == [
+            ("00:00:01,000 --> 00:00:02,000", []),
+            ("00:00:02,000 --> bogus", ["B"]),
+            ("00:00:02,000 --> 00:00:03,000", ["C"]),
+        ]
+        
+        # 无效时间码只跳过该字幕块，其余字幕照常加载
+        srt_file = tmp_path / "malformed.srt"
+        srt_file.write_text(content, encoding='utf-8')
+        stat = srt_file.stat()
+        entries = VideoComposer._read_srt_entries(str(srt_file), stat.st_mtime_ns, stat.st_size)
+        
+        assert [text for text, _, _ in entries] == ["C"]
+    
+    @pytest.mark.unit
+    def test_parse_srt_time(self):
+        """测试标准与非标准时间码"""
+        assert VideoComposer._parse_srt_time("00:02:30,500") == pytest.approx(150.5)
+        assert VideoComposer._parse_srt_time("01:00:00.250") == pytest.approx(3600.25)
+        assert VideoComposer._parse_srt_time("1:02:03,4") == pytest.approx(3723.4)
+        
+        with pytest.raises(ValueError):
+            VideoComposer._parse_srt_time("not a time")
+
+
+class TestSrtFileParsing:
+    """SRT文件流式解析测试类"""
+    
+    @staticmethod
+    def _read(srt_file):
+        stat = srt_file.stat()
+        return VideoComposer._read_srt_entries(str(srt_file), stat.st_mtime_ns, stat.st_size)
+    
+    @pytest.mark.unit
+    def test_read_entries_from_file(self, tmp_path):
+        """测试从文件解析CRLF、多行文本及缺少文本的字幕块"""
+        srt_file = tmp_path / "sample.srt"
+        srt_file.write_bytes(
+            "1\r\n00:00:00,000 --> 00:00:01,500\r\n第一行\r\n第二行\r\n\r\n"
+            "2\r\n00:00:01,500 --> 00:00:02,000\r\n\r\n"
+            "3\r\n00:00:02,000 --> 00:00:03,250\r\nlast".encode('utf-8')
+        )
+        
+        entries = self._read(srt_file)
+        
+        assert [text for text, _, _ in entries] == ["第一行\n第二行", "last"]
+        assert entries[0][1:] == pytest.approx((0.0, 1.5))
+        assert entries[1][1:] == pytest.approx((2.0, 3.25))
+    
+    @pytest.mark.unit
+    def test_invalid_bytes_are_replaced(self, tmp_path):
+        """测试非UTF-8字节不会中断解析"""
+        srt_file = tmp_path / "broken.srt"
+        srt_file.write_bytes(b"1\n00:00:00,000 --> 00:00:01,000\nok \xff\n")
+        
+        entries = self._read(srt_file)
+        
+        assert len(entries) == 1
+        assert entries[0][0].startswith("ok ")
+
+    
+    @pytest.mark.unit
+    def test_cache_invalidated_when_file_changes(self, tmp_path):
+        """测试解析缓存：文件未变化时命中缓存，内容变化后重新解析"""
+        composer = VideoComposer.__new__(VideoComposer)
+        composer.logger = logging.getLogger('story_generator.video')
+        VideoComposer._read_srt_entries.cache_clear()
+        
+        srt_file = tmp_path / "cached.srt"
+        srt_file.write_text("1\n00:00:00,000 --> 00:00:01,000\nbefore\n", encoding='utf-8')
+        
+        first = composer._load_subtitles_from_srt(str(srt_file))
+        first[0].text = "modified by caller"
+        second = composer._load_subtitles_from_srt(str(srt_file))
+        
+        assert second[0].text == "before"
+        assert VideoComposer._read_srt_entries.cache_info().hits == 1
+        
+        # 保持修改时间不变，仅大小变化也应使缓存失效
+        stat = srt_file.stat()
+        srt_file.write_text("1\n00:00:00,000 --> 00:00:02,000\nafter change\n", encoding='utf-8')
+        os.utime(srt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        third = composer._load_subtitles_from_srt(str(srt_file))
+        
+        assert third[0].text == "after change"
+        assert third[0].end_time == pytest.approx(2.0)
+        assert VideoComposer._read_srt_entries.cache_info().misses == 2
+
+
+class TestConcatEntry:
+    """concat列表行生成测试类"""
+    
+    @pytest.mark.unit
+    def test_plain_path(self):
+        """测试普通路径"""
+        assert VideoComposer._concat_entry("/tmp/scene_0.mp4") == "file '/tmp/scene_0.mp4'\n"
+    
+    @pytest.mark.unit
+    def test_path_with_spaces_and_quotes(self):
+        """测试包含空格和单引号的路径"""
+        entry = VideoComposer._concat_entry("/tmp/my videos/it's scene 1.mp4")
+        
+        # 空格在单引号内原样保留；单引号先结束引用、转义后再重新开始引用
+        assert entry == "file '/tmp/my videos/it'\\''s scene 1.mp4'\n"
+    
+    @pytest.mark.unit
+    def test_windows_path_backslashes_unchanged(self):
+        """测试Windows路径中的反斜杠保持原样"""
+        entry = VideoComposer._concat_entry("C:\\Users\\O'Brien\\scene 2.mp4")
+        
+        assert entry == "file 'C:\\Users\\O'\\''Brien\\scene 2.mp4'\n"
+
+
+class TestDropDegenerateScenes:
+    """极短场景过滤测试类"""
+    
+    @pytest.fixture
+    def composer(self):
+        composer = VideoComposer.__new__(VideoComposer)
+        composer.logger = logging.getLogger('story_generator.video')
+        return composer
+    
+    @pytest.mark.unit
+    def test_keeps_scenes_images_and_durations_aligned(self, composer):
+        """测试场景、图像、时长保持一一对应，去掉的时长并入相邻场景"""
+        scenes = ['s0', 's1', 's2', 's3', 's4']
+        images = ['i0', 'i1', 'i2', 'i3', 'i4']
+        durations = [0.01, 2.0, 0.02, 3.0, 0.03]
+        
+        kept_scenes, kept_images, kept_durations = composer._drop_degenerate_scenes(
+            scenes, images, durations)
+        
+        assert kept_scenes == ['s1', 's3']
+        assert kept_images == ['i1', 'i3']
+        # 开头的短场景并入第一个保留场景，其余并入前一个保留场景
+        assert kept_durations == pytest.approx([2.03, 3.03])
+        assert sum(kept_durations) == pytest.approx(sum(durations))
+    
+    @pytest.mark.unit
+    def test_no_degenerate_scenes(self, composer):
+        """测试没有极短场景时原样返回"""
+        scenes, images, durations = ['s0', 's1'], ['i0', 'i1'], [1.0, 2.0]
+        
+        result = composer._drop_degenerate_scenes(scenes, images, durations)
+        
+        assert result == (scenes, images, durations)
+    
+    @pytest.mark.unit
+    def test_all_scenes_degenerate(self, composer):
+        """测试所有场景都极短时保留全部场景，避免生成空视频"""
+        scenes, images, durations = ['s0', 's1'], ['i0', 'i1'], [0.01, 0.02]
+        
+        result = composer._drop_degenerate_scenes(scenes, images, durations)
+        
+        assert result == (scenes, images, durations)
+
+
+
+class TestSceneVideoRetry:
+    """场景视频重试测试类"""
+    
+    @pytest.fixture
+    def composer(self):
+        composer = VideoComposer.__new__(VideoComposer)
+        composer.logger = logging.getLogger('story_generator.video')
+        composer.ffmpeg = 'ffmpeg'
+        composer.hw_encoder = None
+        composer.encode_threads = 1
+        composer.i2v_generator = Mock()
+        composer.i2v_generator.generate_video_async = AsyncMock(
+            return_value=Mock(video_path='/tmp/i2v.mp4', duration_seconds=3.0))
+        composer._should_use_i2v_for_scene = Mock(return_value=True)
+        return composer
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_i2v_encode_failure_is_not_retried(self, composer, tmp_path):
+        """测试本地重编码失败直接抛出，不重复调用远程图生视频API"""
+        image_file = tmp_path / "scene.png"
+        image_file.write_bytes(b"png")
+        scene = Mock(image_prompt="prompt", content="content")
+        image = Mock(file_path=str(image_file))
+        composer._run_encode = AsyncMock(return_value=(1, "encode error"))
+        semaphores = (asyncio.Semaphore(1), asyncio.Semaphore(1))
+        
+        with patch('video.video_composer.asyncio.sleep', new=AsyncMock()) as sleep:
+            with pytest.raises(RuntimeError, match="Failed to encode I2V video"):
+                await composer._create_scene_video_with_retry(scene, image, 3.0, 0, tmp_path, semaphores)
+        
+        composer.i2v_generator.generate_video_async.assert_awaited_once()
+        sleep.assert_not_awaited()
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_i2v_request_failure_is_retried(self, composer, tmp_path):
+        """测试远程图生视频API请求失败时重试"""
+        composer.i2v_generator.generate_video_async.side_effect = [
+            ConnectionError("timeout"), Mock(video_path='/tmp/i2v.mp4', duration_seconds=3.0)]
+        
+        with patch('video.video_composer.asyncio.sleep', new=AsyncMock()):
+            result = await composer._generate_i2v_with_retry(Mock(), asyncio.Semaphore(1), 0)
+        
+        assert result.video_path == '/tmp/i2v.mp4'
+        assert composer.i2v_generator.generate_video_async.await_count == 2
+
+
+class TestFfmpegAffinity:
+    """FFmpeg CPU亲和性测试类"""
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_taskset_prefix_without_preexec_fn(self):
+        """测试固定CPU时以taskset前缀启动FFmpeg，不使用preexec_fn"""
+        composer = VideoComposer.__new__(VideoComposer)
+        composer._affinity_prefix = ['/usr/bin/taskset', '-c', '2,3']
+        composer._spawn_kwargs = {'close_fds': False}
+        process = Mock(returncode=0)
+        process.communicate = AsyncMock(return_value=(None, b''))
+        
+        with patch('video.video_composer.asyncio.create_subprocess_exec',
+                   new=AsyncMock(return_value=process)) as create:
+            assert await composer._run_ffmpeg(['/usr/bin/ffmpeg', '-i', 'in.mp4', 'out.mp4']) == (0, '')
+        
+        args, kwargs = create.call_args
+        assert list(args[:4]) == ['/usr/bin/taskset', '-c', '2,3', '/usr/bin/ffmpeg']
+        assert args[-1] == 'out.mp4'
+        assert 'preexec_fn' not in kwargs
+
+
+# ffmpeg -hide_banner -encoders 输出样例（节选）
+_ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ S..... = Subtitle
+ .F.... = Frame-level multithreading
+ ..S... = Slice-level multithreading
+ ...X.. = Codec is experimental
+ ....B. = Supports draw_horiz_band
+ .....D = Supports direct rendering method 1
+ ------
+ V....D a64multi             Multicolor charset for Commodore 64 (codec a64_multi)
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10 (codec h264)
+ V....D h264_nvenc           NVIDIA NVENC H.264 encoder (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+ A....D libfdk_aac           Fraunhofer FDK AAC (codec aac)
+ S..... ass                  ASS (Advanced SubStation Alpha) subtitle
+"""
+
+
+class TestProbeEncoders:
+    """FFmpeg编码器探测测试类"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        _probe_encoders.cache_clear()
+        yield
+        _probe_encoders.cache_clear()
+    
+    @pytest.mark.unit
+    def test_parses_encoder_names(self):
+        """测试只解析分隔线之后的编码器名称，跳过图例"""
+        with patch('video.video_composer.subprocess.run',
+                   return_value=Mock(stdout=_ENCODERS_OUTPUT)) as run:
+            encoders = _probe_encoders('/usr/bin/ffmpeg')
+        
+        assert encoders == {'a64multi', 'libx264', 'h264_nvenc', 'aac', 'libfdk_aac', 'ass'}
+        run.assert_called_once_with(['/usr/bin/ffmpeg', '-hide_banner', '-encoders'],
+                                    capture_output=True, text=True)
+    
+    @pytest.mark.unit
+    def test_probed_once_per_process(self):
+        """测试探测结果在进程内缓存"""
+        with patch('video.video_composer.subprocess.run',
+                   return_value=Mock(stdout=_ENCODERS_OUTPUT)) as run:
+            _probe_encoders('/usr/bin/ffmpeg')
+            _probe_encoders('/usr/bin/ffmpeg')
+        
+        assert run.call_count == 1
+    
+    @pytest.mark.unit
+    def test_missing_ffmpeg(self):
+        """测试FFmpeg不存在时返回空集合"""
+        with patch('video.video_composer.subprocess.run', side_effect=FileNotFoundError):
+            assert _probe_encoders('/missing/ffmpeg') == frozenset()
+
+
+
+# ffmpeg -hide_banner -filters 输出样例（节选）
+_FILTERS_OUTPUT = """Filters:
+  T.. = Timeline support
+  .S. = Slice threading
+  ..C = Command support
+  A = Audio input/output
+  V = Video input/output
+  N = Dynamic number and/or type of input/output
+  | = Source or sink filter
+ ... abench            A->A       Benchmark part of a filtergraph.
+ T.C ass               V->V       Render ASS subtitles onto input video using the libass library.
+ TSC drawtext          V->V       Draw text on top of video frames using libfreetype library.
+ ..C scale             V->V       Scale the input video size and/or convert the image format.
+ ... zoompan           V->V       Apply Zoom & Pan effect.
+ ... anullsrc          |->A       Null audio source, return empty audio frames.
+"""
+
+
+class TestProbeFilters:
+    """FFmpeg滤镜探测测试类"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        _probe_filters.cache_clear()
+        yield
+        _probe_filters.cache_clear()
+    
+    @staticmethod
+    def _probe(stdout):
+        with patch('video.video_composer.subprocess.run', return_value=Mock(stdout=stdout)):
+            return _probe_filters('/usr/bin/ffmpeg')
+    
+    @pytest.mark.unit
+    def test_parses_filter_names(self):
+        """测试解析滤镜名称，跳过图例行"""
+        assert self._probe(_FILTERS_OUTPUT) == {
+            'abench', 'ass', 'drawtext', 'scale', 'zoompan', 'anullsrc'
+        }
+    
+    @pytest.mark.unit
+    def test_ffmpeg_without_libass(self):
+        """测试FFmpeg未编译libass时滤镜列表中没有ass"""
+        output = '\n'.join(line for line in _FILTERS_OUTPUT.splitlines() if ' ass ' not in line)
+        
+        filters = self._probe(output)
+        
+        assert 'ass' not in filters
+        assert 'drawtext' in filters
+    
+    @pytest.mark.unit
+    def test_missing_ffmpeg(self):
+        """测试FFmpeg不存在时返回空集合（保持默认行为）"""
+        with patch('video.video_composer.subprocess.run', side_effect=FileNotFoundError):
+            assert _probe_filters('/missing/ffmpeg') == frozenset()
@@ -2,15 +2,25 @@
 字幕工具类 - 统一的字幕处理工具
 解决多个字幕处理器中的重复代码问题
 """
+import io
 import re
 import os
+import sys
+import textwrap
 from typing import List, Tuple, Optional
 from PIL import Image, ImageDraw, ImageFont
 
 
+# 字幕数据类的 @dataclass 参数：Python 3.10+ 使用 __slots__ 存储字段（无实例 __dict__，内存更小、属性访问更快）
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class SubtitleUtils:
     """统一的字幕处理工具类"""
     
+    # 字幕样式标识 -> ASS样式名
+    _ASS_STYLE = {'main': 'Main', 'title': 'Title'}
+    
     # 字体缓存
     _font_cache = {}
     _default_font_paths = [
@@ -136,6 +146,69 @@ class SubtitleUtils:
         secs = seconds % 60
         return f"{minutes:02d}:{secs:06.3f}"
     
+    @staticmethod
+    def build_srt(segments) -> str:
+        """
+        拼接SRT字幕内容：每个字幕块一次格式化，块之间以空行分隔
+        
+        Args:
+            segments: 字幕片段列表（需有 text/start_time/end_time 属性）
+            
+        Returns:
+            str: SRT格式内容
+        """
+        fmt = SubtitleUtils.format_srt_time
+        srt_blocks = [
+            f"{i}\n{fmt(segment.start_time)} --> {fmt(segment.end_time)}\n{segment.text}\n"
+            for i, segment in enumerate(segments, 1)
+        ]
+        
+        return '\n'.join(srt_blocks)
+    
+    @staticmethod
+    def build_vtt(segments) -> str:
+        """
+        拼接WebVTT字幕内容
+        
+        Args:
+            segments: 字幕片段列表（需有 text/start_time/end_time 属性）
+            
+        Returns:
+            str: WebVTT格式内容
+        """
+        fmt = SubtitleUtils.format_vtt_time
+        vtt_blocks = [
+            f"{i}\n{fmt(segment.start_time)} --> {fmt(segment.end_time)}\n{segment.text}\n"
+            for i, segment in enumerate(segments, 1)
+        ]
+        
+        return '\n'.join(["WEBVTT\n", *vtt_blocks])
+    
+    @staticmethod
+    def build_ass(header: str, segments) -> str:
+        """
+        拼接ASS字幕内容：头部只写入一次，事件行逐行追加到缓冲区
+        
+        Args:
+            header: ASS头部（Script Info/Styles/Events格式行）
+            segments: 字幕片段列表（需有 text/start_time/end_time/style 属性）
+            
+        Returns:
+            str: ASS格式内容
+        """
+        buffer = io.StringIO()
+        buffer.write(header.strip())
+        write = buffer.write
+        fmt = SubtitleUtils.format_ass_time
+        ass_style = SubtitleUtils._ASS_STYLE
+        
+        for segment in segments:
+            style = segment.style
+            write(f"\nDialogue: 0,{fmt(segment.start_time)},{fmt(segment.end_time)},"
+                  f"{ass_style.get(style) or style.capitalize()},,0,0,0,,{segment.text}")
+        
+        return buffer.getvalue()
+    
     @staticmethod
     def split_text_by_rules(text: str, max_length: int, language: str, 
                            max_pixel_width: int = 640, font_size: int = 48, 
@@ -154,7 +227,9 @@ class SubtitleUtils:
         Returns:
             List[str]: 分割后的文本行列表
         """
-        if not text.strip():
+        # 只在入口处strip一次，下游分割函数不再重复处理首尾空白
+        text = text.strip()
+        if not text:
             return []
         
         # 语言特定的分割规则
@@ -182,7 +257,7 @@ class SubtitleUtils:
         第二层: 按逗号分割长句
         第三层: 强制按像素宽度分割
         """
-        if not text.strip():
+        if not text:
             return []
         
         lines = []
@@ -316,61 +391,31 @@ class SubtitleUtils:
         
         return [line for line in lines if line.strip()]
     
+    @staticmethod
+    def _wrap_words(sentences: List[str], max_length: int) -> List[str]:
+        """按单词边界贪心换行（英文/西班牙文共用，长单词单独成行不截断）"""
+        lines = []
+        for sentence in sentences:
+            # 规整空白：textwrap会保留段首空白和连续空白
+            lines.extend(textwrap.wrap(
+                ' '.join(sentence.split()), width=max_length,
+                break_long_words=False, break_on_hyphens=False
+            ))
+        return lines
+    
     @staticmethod
     def _split_english_text(text: str, max_length: int) -> List[str]:
         """英文文本智能分割"""
         # 按句子分割
         sentences = re.split(r'[.!?]', text)
-        lines = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
-            words = sentence.split()
-            current_line = ""
-            
-            for word in words:
-                if len(current_line + " " + word) <= max_length:
-                    current_line += (" " + word) if current_line else word
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-        
-        return [line for line in lines if line.strip()]
+        return SubtitleUtils._wrap_words(sentences, max_length)
     
     @staticmethod
     def _split_spanish_text(text: str, max_length: int) -> List[str]:
         """西班牙文文本智能分割"""
         # 使用英文分割规则，但考虑西班牙语特殊标点
         sentences = re.split(r'[.!?¡¿]', text)
-        lines = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
-            words = sentence.split()
-            current_line = ""
-            
-            for word in words:
-                if len(current_line + " " + word) <= max_length:
-                    current_line += (" " + word) if current_line else word
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-        
-        return [line for line in lines if line.strip()]
+        return SubtitleUtils._wrap_words(sentences, max_length)
     
     @staticmethod
     def calculate_text_timing(text_segments: List[str], total_duration: float) -> List[Tuple[str, float, float]]:
@@ -3,6 +3,7 @@
 基于原工作流升级，支持多样化动画模式和全屏显示
 """
 import time
+import functools
 from typing import List, Dict, Tuple, Optional, Any
 from pathlib import Path
 import logging
@@ -571,33 +572,57 @@ class EnhancedAnimationProcessor:
             if not animation_clip.keyframes or not animation_clip.ken_burns_params:
                 return self._generate_basic_filter(video_resolution)
             
-            video_width, video_height = video_resolution
             params = animation_clip.ken_burns_params
-            
-            # 根据模式生成对应的zoompan滤镜
-            mode = params.get('mode')
-            if mode in ['zoom_in_center', 'center_zoom_in']:
-                return self._generate_zoom_in_center_filter(params, video_resolution, animation_clip.duration_seconds)
-            elif mode == 'center_zoom_out':
-                return self._generate_center_zoom_out_filter(params, video_resolution, animation_clip.duration_seconds)
-            elif mode == 'zoom_out_left':
-                return self._generate_zoom_out_left_filter(params, video_resolution, animation_clip.duration_seconds)
-            elif mode == 'pan_right_zoom':
-                return self._generate_pan_right_zoom_filter(params, video_resolution, animation_clip.duration_seconds)
-            elif mode == 'diagonal_zoom':
-                return self._generate_diagonal_zoom_filter(params, video_resolution, animation_clip.duration_seconds)
-            elif mode in ['move_left', 'move_right', 'move_up', 'move_down']:
-                return self._generate_simple_pan_filter(params, video_resolution, animation_clip.duration_seconds)
-            elif params.get('mode') in ['smooth_drift', 'spiral_zoom', 'wave_motion']:
-                return self._generate_complex_motion_filter(animation_clip, video_resolution)
-            else:
-                return self._generate_basic_zoom_filter(params, video_resolution, animation_clip.duration_seconds)
+            video_width, video_height = video_resolution
+            # 滤镜只取决于模式、缩放范围、时长与分辨率，相同组合直接复用
+            return self._cached_mode_filter(params.get('mode'), params.get('zoom_start'), params.get('zoom_end'),
+                                            round(animation_clip.duration_seconds, 3), video_width, video_height)
                 
         except Exception as e:
             self.logger.error(f"Failed to generate enhanced FFmpeg filter: {e}")
             return self._generate_basic_filter(video_resolution)
     
-    def _generate_zoom_in_center_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _cached_mode_filter(mode: Optional[str], zoom_start: Optional[float], zoom_end: Optional[float],
+                            duration: float, width: int, height: int) -> str:
+        """
+        按模式生成zoompan滤镜（带缓存），并在生成时校验不含旧式时间表达式
+        
+        滤镜只取决于参数值，缓存以参数为键、不持有处理器实例
+        """
+        params = {'mode': mode}
+        if zoom_start is not None:
+            params['zoom_start'] = zoom_start
+        if zoom_end is not None:
+            params['zoom_end'] = zoom_end
+        video_resolution = (width, height)
+        
+        # 根据模式生成对应的zoompan滤镜
+        if mode in ['zoom_in_center', 'center_zoom_in']:
+            animation_filter = EnhancedAnimationProcessor._generate_zoom_in_center_filter(params, video_resolution, duration)
+        elif mode == 'center_zoom_out':
+            animation_filter = EnhancedAnimationProcessor._generate_center_zoom_out_filter(params, video_resolution, duration)
+        elif mode == 'zoom_out_left':
+            animation_filter = EnhancedAnimationProcessor._generate_zoom_out_left_filter(params, video_resolution, duration)
+        elif mode == 'pan_right_zoom':
+            animation_filter = EnhancedAnimationProcessor._generate_pan_right_zoom_filter(params, video_resolution, duration)
+        elif mode == 'diagonal_zoom':
+            animation_filter = EnhancedAnimationProcessor._generate_diagonal_zoom_filter(params, video_resolution, duration)
+        elif mode in ['move_left', 'move_right', 'move_up', 'move_down']:
+            animation_filter = EnhancedAnimationProcessor._generate_simple_pan_filter(params, video_resolution, duration)
+        elif mode in ['smooth_drift', 'spiral_zoom', 'wave_motion']:
+            animation_filter = EnhancedAnimationProcessor._generate_complex_motion_filter(duration, video_resolution)
+        else:
+            animation_filter = EnhancedAnimationProcessor._generate_basic_zoom_filter(params, video_resolution, duration)
+        
+        # 禁止旧的基于t的表达式混入（zoompan中应使用on帧序号）
+        if 't/' in animation_filter:
+            raise ValueError(f"Legacy time-based expression in {mode} filter: {animation_filter}")
+        return animation_filter
+    
+    @staticmethod
+    def _generate_zoom_in_center_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成中心放大滤镜"""
         width, height = resolution
         zoom_start = params.get('zoom_start', 1.0)
@@ -610,7 +635,8 @@ class EnhancedAnimationProcessor:
                 f"zoompan=z='min({zoom_start}+({zoom_end}-{zoom_start})*on/{frames},{zoom_end})'"
                 f":d={frames}:s={width}x{height}:fps=30")
 
-    def _generate_center_zoom_out_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    def _generate_center_zoom_out_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成中心缩小滤镜"""
         width, height = resolution
         zoom_start = params.get('zoom_start', 1.1)
@@ -621,7 +647,8 @@ class EnhancedAnimationProcessor:
                 f"zoompan=z='max({zoom_start}-({zoom_start}-{zoom_end})*on/{frames},{zoom_end})'"
                 f":d={frames}:s={width}x{height}:fps=30")
     
-    def _generate_zoom_out_left_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    def _generate_zoom_out_left_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成左侧缩小滤镜"""
         width, height = resolution
         frames = int(duration * 30)
@@ -632,7 +659,8 @@ class EnhancedAnimationProcessor:
                 f":x='iw*(0.1-0.2*on/{frames})'"
                 f":d={frames}:s={width}x{height}:fps=30")
     
-    def _generate_pan_right_zoom_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    def _generate_pan_right_zoom_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成右移缩放滤镜"""
         width, height = resolution
         frames = int(duration * 30)
@@ -643,7 +671,8 @@ class EnhancedAnimationProcessor:
                 f":x='iw*(-0.15+0.3*on/{frames})'"
                 f":d={frames}:s={width}x{height}:fps=30")
 
-    def _generate_simple_pan_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    def _generate_simple_pan_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成简单平移动作（不缩放，缓慢）"""
         width, height = resolution
         frames = int(duration * 30)
@@ -671,7 +700,8 @@ class EnhancedAnimationProcessor:
         return (base +
                 f"zoompan=z='1.0':x='{x}':y='{y}':d={frames}:s={width}x{height}:fps=30")
     
-    def _generate_diagonal_zoom_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    def _generate_diagonal_zoom_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成对角缩放滤镜"""
         width, height = resolution
         frames = int(duration * 30)
@@ -683,10 +713,10 @@ class EnhancedAnimationProcessor:
                 f":y='ih*(0.1-0.2*on/{frames})'"
                 f":d={frames}:s={width}x{height}:fps=30")
     
-    def _generate_complex_motion_filter(self, animation_clip: AnimationClip, resolution: Tuple[int, int]) -> str:
+    @staticmethod
+    def _generate_complex_motion_filter(duration: float, resolution: Tuple[int, int]) -> str:
         """生成复杂运动滤镜（用于螺旋、波浪等）"""
         width, height = resolution
-        duration = animation_clip.duration_seconds
         frames = int(duration * 30)
         
         # 对于复杂运动，使用基础缩放 + 后期可以添加更复杂的表达式
@@ -697,7 +727,8 @@ class EnhancedAnimationProcessor:
                 f":y='ih*0.05*sin(8*PI*on/{frames})'"
                 f":d={frames}:s={width}x{height}:fps=30")
     
-    def _generate_basic_zoom_filter(self, params: Dict, resolution: Tuple[int, int], duration: float) -> str:
+    @staticmethod
+    def _generate_basic_zoom_filter(params: Dict, resolution: Tuple[int, int], duration: float) -> str:
         """生成基础缩放滤镜"""
         width, height = resolution
         zoom_start = params.get('zoom_start', 1.0)
@@ -14,11 +14,62 @@ from abc import ABC, abstractmethod
 
 from core.config_manager import ConfigManager
 from utils.file_manager import FileManager
-from utils.subtitle_utils import SubtitleUtils
+from utils.subtitle_utils import SubtitleUtils, DATACLASS_SLOTS
 from utils.font_manager import FontManager
 
 
-@dataclass
+# 字体文件名前缀 -> ASS字体族名称
+_ASS_FONT_FAMILIES = {
+    "NotoSansCJK": "Noto Sans CJK SC",
+    "wqy-microhei": "WenQuanYi Micro Hei",
+    "msyh": "Microsoft YaHei",
+    "PingFang": "PingFang SC",
+}
+
+# ASS颜色转换支持的颜色名称（与FFmpeg drawtext可用的颜色名称一致，不区分大小写）
+_NAMED_COLORS = {
+    "aliceblue": "F0F8FF", "antiquewhite": "FAEBD7", "aqua": "00FFFF", "aquamarine": "7FFFD4",
+    "azure": "F0FFFF", "beige": "F5F5DC", "bisque": "FFE4C4", "black": "000000",
+    "blanchedalmond": "FFEBCD", "blue": "0000FF", "blueviolet": "8A2BE2", "brown": "A52A2A",
+    "burlywood": "DEB887", "cadetblue": "5F9EA0", "chartreuse": "7FFF00", "chocolate": "D2691E",
+    "coral": "FF7F50", "cornflowerblue": "6495ED", "cornsilk": "FFF8DC", "crimson": "DC143C",
+    "cyan": "00FFFF", "darkblue": "00008B", "darkcyan": "008B8B", "darkgoldenrod": "B8860B",
+    "darkgray": "A9A9A9", "darkgreen": "006400", "darkkhaki": "BDB76B", "darkmagenta": "8B008B",
+    "darkolivegreen": "556B2F", "darkorange": "FF8C00", "darkorchid": "9932CC", "darkred": "8B0000",
+    "darksalmon": "E9967A", "darkseagreen": "8FBC8F", "darkslateblue": "483D8B",
+    "darkslategray": "2F4F4F", "darkturquoise": "00CED1", "darkviolet": "9400D3",
+    "deeppink": "FF1493", "deepskyblue": "00BFFF", "dimgray": "696969", "dodgerblue": "1E90FF",
+    "firebrick": "B22222", "floralwhite": "FFFAF0", "forestgreen": "228B22", "fuchsia": "FF00FF",
+    "gainsboro": "DCDCDC", "ghostwhite": "F8F8FF", "gold": "FFD700", "goldenrod": "DAA520",
+    "gray": "808080", "green": "008000", "greenyellow": "ADFF2F", "honeydew": "F0FFF0",
+    "hotpink": "FF69B4", "indianred": "CD5C5C", "indigo": "4B0082", "ivory": "FFFFF0",
+    "khaki": "F0E68C", "lavender": "E6E6FA", "lavenderblush": "FFF0F5", "lawngreen": "7CFC00",
+    "lemonchiffon": "FFFACD", "lightblue": "ADD8E6", "lightcoral": "F08080", "lightcyan": "E0FFFF",
+    "lightgoldenrodyellow": "FAFAD2", "lightgray": "D3D3D3", "lightgreen": "90EE90",
+    "lightpink": "FFB6C1", "lightsalmon": "FFA07A", "lightseagreen": "20B2AA",
+    "lightskyblue": "87CEFA", "lightslategray": "778899", "lightsteelblue": "B0C4DE",
+    "lightyellow": "FFFFE0", "lime": "00FF00", "limegreen": "32CD32", "linen": "FAF0E6",
+    "magenta": "FF00FF", "maroon": "800000", "mediumaquamarine": "66CDAA", "mediumblue": "0000CD",
+    "mediumorchid": "BA55D3", "mediumpurple": "9370DB", "mediumseagreen": "3CB371",
+    "mediumslateblue": "7B68EE", "mediumspringgreen": "00FA9A", "mediumturquoise": "48D1CC",
+    "mediumvioletred": "C71585", "midnightblue": "191970", "mintcream": "F5FFFA",
+    "mistyrose": "FFE4E1", "moccasin": "FFE4B5", "navajowhite": "FFDEAD", "navy": "000080",
+    "oldlace": "FDF5E6", "olive": "808000", "olivedrab": "6B8E23", "orange": "FFA500",
+    "orangered": "FF4500", "orchid": "DA70D6", "palegoldenrod": "EEE8AA", "palegreen": "98FB98",
+    "paleturquoise": "AFEEEE", "palevioletred": "DB7093", "papayawhip": "FFEFD5",
+    "peachpuff": "FFDAB9", "peru": "CD853F", "pink": "FFC0CB", "plum": "DDA0DD",
+    "powderblue": "B0E0E6", "purple": "800080", "red": "FF0000", "rosybrown": "BC8F8F",
+    "royalblue": "4169E1", "saddlebrown": "8B4513", "salmon": "FA8072", "sandybrown": "F4A460",
+    "seagreen": "2E8B57", "seashell": "FFF5EE", "sienna": "A0522D", "silver": "C0C0C0",
+    "skyblue": "87CEEB", "slateblue": "6A5ACD", "slategray": "708090", "snow": "FFFAFA",
+    "springgreen": "00FF7F", "steelblue": "4682B4", "tan": "D2B48C", "teal": "008080",
+    "thistle": "D8BFD8", "tomato": "FF6347", "turquoise": "40E0D0", "violet": "EE82EE",
+    "wheat": "F5DEB3", "white": "FFFFFF", "whitesmoke": "F5F5F5", "yellow": "FFFF00",
+    "yellowgreen": "9ACD32",
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class SubtitleSegment:
     """统一的字幕片段数据结构"""
     text: str                           # 字幕文本
@@ -122,6 +173,20 @@ class SubtitleEngine:
         
         # 对齐组件（延迟初始化）
         self._alignment_manager = None
+
+        # 中文字体检测结果缓存
+        self._chinese_font_path: Optional[str] = None
+        self._font_detected = False
+        
+        # FFmpeg/FFprobe可执行文件（由视频合成器设置为解析后的绝对路径，避免每次启动进程都查找PATH）
+        self.ffmpeg = 'ffmpeg'
+        self.ffprobe = 'ffprobe'
+        # 渲染字幕时使用的视频编码参数（如硬件编码器）；为None时使用libx264
+        self.video_encoder_args: Optional[List[str]] = None
+        # 输出MP4的movflags（由视频合成器按配置设置，可切换为分片MP4）
+        self.mp4_movflags = '+faststart'
+        # FFmpeg是否支持ass滤镜（由视频合成器启动时探测设置）；不支持时直接使用drawtext渲染
+        self.ass_filter_available = True
         
         self.logger.info("SubtitleEngine initialized with unified architecture and font manager")
     
@@ -535,18 +600,7 @@ class SubtitleEngine:
     
     def _generate_srt(self, segments: List[SubtitleSegment]) -> str:
         """生成SRT格式内容"""
-        srt_content = []
-        
-        for i, segment in enumerate(segments, 1):
-            start_time = SubtitleUtils.format_srt_time(segment.start_time)
-            end_time = SubtitleUtils.format_srt_time(segment.end_time)
-            
-            srt_content.append(f"{i}")
-            srt_content.append(f"{start_time} --> {end_time}")
-            srt_content.append(segment.text)
-            srt_content.append("")  # 空行分隔
-        
-        return '\n'.join(srt_content)
+        return SubtitleUtils.build_srt(segments)
     
     def _generate_ass(self, segments: List[SubtitleSegment]) -> str:
         """生成ASS格式内容"""
@@ -564,32 +618,11 @@ Style: Title,Arial,40,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,10
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
         
-        ass_content = [ass_header.strip()]
-        
-        for segment in segments:
-            start_time = SubtitleUtils.format_ass_time(segment.start_time)
-            end_time = SubtitleUtils.format_ass_time(segment.end_time)
-            
-            style_name = segment.style.capitalize()
-            event = f"Dialogue: 0,{start_time},{end_time},{style_name},,0,0,0,,{segment.text}"
-            ass_content.append(event)
-        
-        return '\n'.join(ass_content)
+        return SubtitleUtils.build_ass(ass_header, segments)
     
     def _generate_vtt(self, segments: List[SubtitleSegment]) -> str:
         """生成VTT格式内容"""
-        vtt_content = ["WEBVTT", ""]
-        
-        for i, segment in enumerate(segments, 1):
-            start_time = SubtitleUtils.format_vtt_time(segment.start_time)
-            end_time = SubtitleUtils.format_vtt_time(segment.end_time)
-            
-            vtt_content.append(f"{i}")
-            vtt_content.append(f"{start_time} --> {end_time}")
-            vtt_content.append(segment.text)
-            vtt_content.append("")
-        
-        return '\n'.join(vtt_content)
+        return SubtitleUtils.build_vtt(segments)
     
     def render_to_video(self, video_path: str, segments: List[SubtitleSegment], 
                        output_path: str, renderer_name: str = None, 
@@ -634,6 +667,21 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             self.logger.error(f"Video rendering error: {e}")
             return False
     
+    def _run_render(self, cmd: List[str], output_args: List[str], preset: str) -> subprocess.CompletedProcess:
+        """
+        执行字幕渲染的FFmpeg命令（在cmd与output_args之间插入视频编码参数）
+        
+        设置了 video_encoder_args（硬件编码器）时优先使用，失败则关闭硬件编码并用libx264重试一次
+        """
+        if self.video_encoder_args:
+            result = subprocess.run([*cmd, *self.video_encoder_args, *output_args], capture_output=True, text=True)
+            if result.returncode == 0:
+                return result
+            self.logger.warning(f"Hardware encoder failed, falling back to libx264: {result.stderr}")
+            self.video_encoder_args = None
+        return subprocess.run([*cmd, '-c:v', 'libx264', '-preset', preset, *output_args],
+                              capture_output=True, text=True)
+    
     def _render_jianying_style(self, video_path: str, segments: List[SubtitleSegment], 
                               output_path: str, style: SubtitleStyle) -> bool:
         """剪映风格渲染（集成版）"""
@@ -642,7 +690,13 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             
             # 获取字体路径
             font_path = self._detect_chinese_font()
-            
+
+            # 🎯 优先使用单个ass滤镜渲染（淡入淡出/背景框由libass处理），避免drawtext滤镜链膨胀
+            if self._render_jianying_ass(video_path, segments, output_path, style, font_path):
+                return True
+            if self.ass_filter_available:
+                self.logger.warning("ASS rendering failed, falling back to drawtext filters")
+
             # 🔧 分批渲染解决大量滤镜问题
             if len(segments) > 20:
                 self.logger.warning(f"Large subtitle count ({len(segments)}), using batch rendering")
@@ -707,23 +761,21 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             filter_chain = "[0:v]" + ",".join(drawtext_filters) + "[v]"
             
             cmd = [
-                'ffmpeg', '-y',
+                self.ffmpeg, '-y',
                 '-i', video_path,
                 '-filter_complex', filter_chain,
                 '-map', '[v]',
                 '-map', '0:a',
                 '-c:a', 'copy',
-                '-c:v', 'libx264',
-                '-preset', 'fast',
-                output_path
             ]
+            output_args = ['-movflags', self.mp4_movflags, output_path]
             
             # 添加详细调试日志
             self.logger.info(f"FFmpeg command: {' '.join(cmd[:10])}... (total {len(cmd)} args)")
             self.logger.info(f"Filter chain length: {len(filter_chain)} chars, {len(drawtext_filters)} drawtext filters")
             self.logger.debug(f"Full filter chain: {filter_chain}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self._run_render(cmd, output_args, preset='fast')
             
             if result.returncode == 0:
                 self.logger.info("Jianying subtitles rendered successfully")
@@ -737,7 +789,194 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             self.logger.error(f"Jianying rendering error: {e}")
             return False
     
-    def _render_jianying_batch(self, video_path: str, segments: List[SubtitleSegment], 
+    def _render_jianying_ass(self, video_path: str, segments: List[SubtitleSegment],
+                             output_path: str, style: SubtitleStyle, font_path: Optional[str]) -> bool:
+        """剪映风格ASS渲染 - 所有字幕段落写入一个ASS脚本，由单个ass滤镜完成合成"""
+        if not segments or not self.ass_filter_available:
+            return False
+
+        ass_file = None
+        try:
+            ass_filter, ass_file = self._prepare_jianying_ass_filter(
+                segments, style, font_path, self._get_video_duration(video_path)
+            )
+
+            cmd = [
+                self.ffmpeg, '-y',
+                '-i', video_path,
+                '-vf', ass_filter,
+                '-c:a', 'copy',
+            ]
+            output_args = ['-movflags', self.mp4_movflags, output_path]
+
+            self.logger.info(f"Rendering {len(segments)} subtitles with single ass filter")
+            result = self._run_render(cmd, output_args, preset='fast')
+
+            if result.returncode == 0:
+                self.logger.info("Jianying subtitles rendered successfully (ASS)")
+                return True
+            else:
+                self.logger.error(f"Jianying ASS rendering failed: {result.stderr}")
+                return False
+
+        except Exception as e:
+            self.logger.error(f"Jianying ASS rendering error: {e}")
+            return False
+        finally:
+            if ass_file:
+                Path(ass_file).unlink(missing_ok=True)
+
+    def create_subtitle_filter(self, segments: List[SubtitleSegment], renderer_name: str,
+                               style_name: str, video_duration: Optional[float]) -> Optional[Tuple[str, str]]:
+        """
+        生成可直接嵌入FFmpeg滤镜图的字幕滤镜（供视频合成时单次编码烧录字幕）
+        
+        Args:
+            segments: 字幕段落列表
+            renderer_name: 渲染器名称（目前仅支持jianying）
+            style_name: 样式名称
+            video_duration: 视频时长（最后一段字幕延伸到视频结束）
+            
+        Returns:
+            Optional[Tuple[str, str]]: (滤镜字符串, 临时ASS文件路径)，不支持时返回None；
+            ASS文件由调用方在编码结束后删除
+        """
+        if not segments or renderer_name != 'jianying' or not self.ass_filter_available:
+            return None
+        
+        style = self.styles.get(style_name, self.styles['main'])
+        try:
+            return self._prepare_jianying_ass_filter(
+                segments, style, self._detect_chinese_font(), video_duration
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to prepare subtitle filter: {e}")
+            return None
+    
+    def _prepare_jianying_ass_filter(self, segments: List[SubtitleSegment], style: SubtitleStyle,
+                                     font_path: Optional[str], video_duration: Optional[float]) -> Tuple[str, str]:
+        """写出剪映风格ASS脚本并返回 (ass滤镜字符串, ASS文件路径)"""
+        # 🎯 最后一段字幕延伸到视频结束（与分批渲染保持一致）
+        final_end = segments[-1].end_time
+        if video_duration and final_end < video_duration:
+            final_end = video_duration + 0.1
+
+        ass_file = self._create_temp_ass_file(
+            self._generate_jianying_ass(segments, style, font_path, final_end)
+        )
+
+        ass_filter = f"ass={self._escape_filter_arg(str(ass_file))}"
+        if font_path:
+            ass_filter += f":fontsdir={self._escape_filter_arg(str(Path(font_path).parent))}"
+        return ass_filter, ass_file
+
+    @staticmethod
+    def _escape_filter_arg(value: str) -> str:
+        """
+        按FFmpeg规则转义滤镜参数值（如文件路径）
+
+        先转义选项值中的 \\ ' :（Windows盘符的冒号会被当作选项分隔符），
+        再转义滤镜图中的 \\ ' [ ] , ;，结果可直接用于 -vf 与 -filter_complex
+        """
+        value = re.sub(r"([\\':])", r"\\\1", value)
+        return re.sub(r"([\\'\[\],;])", r"\\\1", value)
+
+    def _generate_jianying_ass(self, segments: List[SubtitleSegment], style: SubtitleStyle,
+                               font_path: Optional[str], final_end: float) -> str:
+        """
+        生成剪映风格ASS脚本
+
+        - Text层: 白字黑边，对应drawtext的fontcolor/borderw/bordercolor
+        - Box层: BorderStyle=3的半透明背景框，对应drawtext的box/boxcolor
+        - 淡入淡出使用\\fad标签，替代drawtext的alpha时间表达式
+        """
+        play_res_x, play_res_y = map(int, self.config.get_video_config().resolution.split('x'))
+        font_name = self._get_ass_font_name(font_path, style)
+        primary = self._to_ass_color(style.font_color)
+        outline = self._to_ass_color(style.border_color)
+
+        style_lines = [
+            f"Style: Text,{font_name},{style.font_size},{primary},&H000000FF,{outline},&H00000000,"
+            f"0,0,0,0,100,100,0,0,1,{style.border_width},0,{style.alignment},10,10,{style.margin_v},1"
+        ]
+        if style.background_enabled:
+            box = self._to_ass_color(style.background_color)
+            # 主色完全透明，只保留背景框
+            style_lines.append(
+                f"Style: Box,{font_name},{style.font_size},&HFF000000,&H000000FF,{box},&H00000000,"
+                f"0,0,0,0,100,100,0,0,3,12,0,{style.alignment},10,10,{style.margin_v},1"
+            )
+
+        fade_tag = ""
+        if style.fade_enabled:
+            fade_ms = int(style.fade_duration * 1000)
+            fade_tag = f"{{\\fad({fade_ms},{fade_ms})}}"
+
+        events = []
+        last_index = len(segments) - 1
+        for i, segment in enumerate(segments):
+            lines = self._smart_text_wrap_jianying(segment.text, style)
+            # 花括号在ASS中表示覆盖标签，替换为全角字符
+            text = '\\N'.join(lines).replace('{', '｛').replace('}', '｝')
+            start = SubtitleUtils.format_ass_time(segment.start_time)
+            end = SubtitleUtils.format_ass_time(final_end if i == last_index else segment.end_time)
+
+            if style.background_enabled:
+                events.append(f"Dialogue: 0,{start},{end},Box,,0,0,0,,{fade_tag}{text}")
+            events.append(f"Dialogue: 1,{start},{end},Text,,0,0,0,,{fade_tag}{text}")
+
+        header = [
+            "[Script Info]",
+            "Title: Jianying Subtitles",
+            "ScriptType: v4.00+",
+            f"PlayResX: {play_res_x}",
+            f"PlayResY: {play_res_y}",
+            "WrapStyle: 2",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+            *style_lines,
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+
+        return '\n'.join(header + events) + '\n'
+
+    def _create_temp_ass_file(self, content: str) -> str:
+        """创建临时ASS文件（唯一文件名，避免并发冲突）"""
+        import uuid
+        temp_file = self.file_manager.get_output_path('temp', f'jianying_{uuid.uuid4().hex[:8]}.ass')
+
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        return str(temp_file)
+
+    def _get_ass_font_name(self, font_path: Optional[str], style: SubtitleStyle) -> str:
+        """根据字体文件推断ASS字体族名称（libass按族名匹配fontsdir中的字体）"""
+        if font_path:
+            stem = Path(font_path).stem
+            for prefix, family in _ASS_FONT_FAMILIES.items():
+                if stem.startswith(prefix):
+                    return family
+        return style.font_family
+
+    @staticmethod
+    def _to_ass_color(color: str) -> str:
+        """将 #RRGGBB / 0xRRGGBB / yellow@0.7 形式的颜色（FFmpeg颜色语法）转换为ASS的 &HAABBGGRR"""
+        name, _, opacity = color.partition('@')
+        hex_rgb = name[2:] if name[:2].lower() == '0x' else name.lstrip('#')
+        rgb = _NAMED_COLORS.get(name.lower(), hex_rgb)
+        if not re.fullmatch(r'[0-9A-Fa-f]{6}', rgb):
+            rgb = 'FFFFFF'
+        try:
+            alpha = round((1.0 - float(opacity)) * 255) if opacity else 0
+        except ValueError:
+            alpha = 0
+        return f"&H{alpha:02X}{rgb[4:6]}{rgb[2:4]}{rgb[0:2]}".upper()
+
+    def _render_jianying_batch(self, video_path: str, segments: List[SubtitleSegment],
                               output_path: str, style: SubtitleStyle) -> bool:
         """剪映风格分批渲染 - 解决大量字幕问题"""
         try:
@@ -819,20 +1058,18 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 filter_chain = "[0:v]" + ",".join(drawtext_filters) + "[v]"
                 
                 cmd = [
-                    'ffmpeg', '-y',
+                    self.ffmpeg, '-y',
                     '-i', current_video,
                     '-filter_complex', filter_chain,
                     '-map', '[v]',
                     '-map', '0:a',
                     '-c:a', 'copy',
-                    '-c:v', 'libx264',
-                    '-preset', 'fast',
-                    temp_output
                 ]
+                output_args = ['-movflags', self.mp4_movflags, temp_output]
                 
                 self.logger.info(f"Batch {batch_start//batch_size + 1}: {len(drawtext_filters)} filters, chain length: {len(filter_chain)}")
                 
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = self._run_render(cmd, output_args, preset='fast')
                 
                 if result.returncode != 0:
                     self.logger.error(f"Batch {batch_start//batch_size + 1} failed: {result.stderr}")
@@ -852,7 +1089,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
     def _get_video_duration(self, video_path: str) -> Optional[float]:
         """获取视频时长"""
         try:
-            cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', video_path]
+            cmd = [self.ffprobe, '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', video_path]
             result = subprocess.run(cmd, capture_output=True, text=True)
             if result.returncode == 0:
                 return float(result.stdout.strip())
@@ -876,16 +1113,14 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                             f"Outline={style.border_width}")
             
             cmd = [
-                'ffmpeg', '-y',
+                self.ffmpeg, '-y',
                 '-i', video_path,
                 '-vf', f"subtitles='{temp_srt}':force_style='{subtitle_style}'",
                 '-c:a', 'copy',
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                output_path
             ]
+            output_args = ['-movflags', self.mp4_movflags, output_path]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self._run_render(cmd, output_args, preset='medium')
             
             # 清理临时文件
             try:
@@ -926,11 +1161,26 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         return temp_file
     
     def _detect_chinese_font(self) -> Optional[str]:
-        """检测中文字体"""
+        """检测中文字体（每个目录只读取一次，结果缓存在实例上）"""
+        if self._font_detected:
+            return self._chinese_font_path
+
+        dir_entries: Dict[str, set] = {}
         for font_path in self.subtitle_config['font_detection_paths']:
-            if os.path.exists(font_path):
-                return font_path
-        return None
+            font_dir, font_name = os.path.split(font_path)
+            font_dir = font_dir or '.'
+            if font_dir not in dir_entries:
+                try:
+                    with os.scandir(font_dir) as it:
+                        dir_entries[font_dir] = {entry.name for entry in it}
+                except OSError:
+                    dir_entries[font_dir] = set()
+            if font_name in dir_entries[font_dir]:
+                self._chinese_font_path = font_path
+                break
+
+        self._font_detected = True
+        return self._chinese_font_path
     
     def create_title_subtitles(self, title: str, duration: float = 3.0, 
                               start_time: float = 0.0) -> List[SubtitleSegment]:
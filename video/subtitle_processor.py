@@ -4,6 +4,10 @@
 """
 import re
 import time
+import functools
+from collections import Counter
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional, Any
 from pathlib import Path
 import logging
@@ -12,9 +16,15 @@ import json
 
 from core.config_manager import ConfigManager
 from utils.file_manager import FileManager
-from utils.subtitle_utils import SubtitleUtils
+from utils.subtitle_utils import SubtitleUtils, DATACLASS_SLOTS
 
-@dataclass
+
+@functools.lru_cache(maxsize=4096)
+def _cached_split(text: str, max_chars: int, language: str) -> Tuple[str, ...]:
+    """缓存文本分割结果 - 相同(文本, 最大字符数, 语言)直接复用"""
+    return tuple(SubtitleUtils.split_text_by_rules(text, max_chars, language))
+
+@dataclass(**DATACLASS_SLOTS)
 class SubtitleSegment:
     """字幕片段"""
     text: str                    # 字幕文本
@@ -24,7 +34,7 @@ class SubtitleSegment:
     position: str = "bottom"    # 位置（bottom, top, center）
     style: str = "main"         # 样式（main, title）
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SubtitleProcessorRequest:
     """字幕处理器专用请求 - 用于基础文本分割和时间同步"""
     text: str                   # 原始文本
@@ -105,10 +115,12 @@ class SubtitleProcessor:
             # 计算时间分配
             segments = self._assign_timing(text_segments, request.scene_duration)
             
-            # 设置样式和位置
+            # 设置样式和位置（样式查找提到循环外）
+            style_name = request.style
+            position = self.styles[style_name]['position']
             for segment in segments:
-                segment.style = request.style
-                segment.position = self.styles[request.style]['position']
+                segment.style = style_name
+                segment.position = position
             
             self.logger.info(f"Generated {len(segments)} subtitle segments")
             
@@ -140,12 +152,15 @@ class SubtitleProcessor:
         # 使用动态计算的最大字符数（估算值）
         max_chars = int(self.max_text_width / self.subtitle_config.get('font_size', 48) * 1.2)
         max_chars = max(8, min(max_chars, 16))  # 限制在合理范围
-        return SubtitleUtils.split_text_by_rules(text, max_chars, language)
+        return list(_cached_split(text, max_chars, language))
     
     def _assign_timing(self, text_segments: List[str], total_duration: float) -> List[SubtitleSegment]:
         """
         为文本片段分配时间
         
+        生成的片段按时间顺序首尾相接：每段的开始时间等于上一段的结束时间，
+        最后一段结束于 total_duration
+        
         Args:
             text_segments: 文本片段列表
             total_duration: 总时长
@@ -156,37 +171,30 @@ class SubtitleProcessor:
         if not text_segments:
             return []
         
-        segments = []
+        # 按文本长度的累计占比计算结束时间（单次累加，无逐段浮点累积误差）
+        lengths = [len(text) for text in text_segments]
+        total_length = sum(lengths)
         
-        # 计算每个片段的权重（基于文本长度）
-        total_length = sum(len(segment) for segment in text_segments)
+        if total_length > 0:
+            scale = total_duration / total_length
+            end_times = [cumulative * scale for cumulative in accumulate(lengths)]
+        else:
+            step = total_duration / len(text_segments)
+            end_times = [k * step for k in range(1, len(text_segments) + 1)]
         
-        current_time = 0.0
+        # 确保最后一个片段准确结束
+        end_times[-1] = total_duration
+        start_times = [0.0] + end_times[:-1]
         
-        for i, text in enumerate(text_segments):
-            # 根据文本长度分配时间
-            if total_length > 0:
-                segment_duration = (len(text) / total_length) * total_duration
-            else:
-                segment_duration = total_duration / len(text_segments)
-            
-            # 确保最后一个片段准确结束
-            if i == len(text_segments) - 1:
-                end_time = total_duration
-            else:
-                end_time = current_time + segment_duration
-            
-            segment = SubtitleSegment(
+        return [
+            SubtitleSegment(
                 text=text,
-                start_time=current_time,
+                start_time=start_time,
                 end_time=end_time,
-                duration=end_time - current_time
+                duration=end_time - start_time
             )
-            
-            segments.append(segment)
-            current_time = end_time
-        
-        return segments
+            for text, start_time, end_time in zip(text_segments, start_times, end_times)
+        ]
     
     def generate_srt(self, segments: List[SubtitleSegment]) -> str:
         """
@@ -198,19 +206,7 @@ class SubtitleProcessor:
         Returns:
             str: SRT格式内容
         """
-        srt_content = []
-        
-        for i, segment in enumerate(segments, 1):
-            # 时间格式：HH:MM:SS,mmm
-            start_time = self._format_srt_time(segment.start_time)
-            end_time = self._format_srt_time(segment.end_time)
-            
-            srt_content.append(f"{i}")
-            srt_content.append(f"{start_time} --> {end_time}")
-            srt_content.append(segment.text)
-            srt_content.append("")  # 空行分隔
-        
-        return '\n'.join(srt_content)
+        return SubtitleUtils.build_srt(segments)
     
     def _format_srt_time(self, seconds: float) -> str:
         """格式化SRT时间 - 使用统一工具类"""
@@ -239,18 +235,7 @@ Style: Title,Arial,40,&H00000000,&H000000FF,&H00FFFFFF,&H80000000,1,0,0,0,100,10
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
         
-        ass_content = [ass_header.strip()]
-        
-        for segment in segments:
-            start_time = self._format_ass_time(segment.start_time)
-            end_time = self._format_ass_time(segment.end_time)
-            
-            style_name = segment.style.capitalize()
-            
-            event = f"Dialogue: 0,{start_time},{end_time},{style_name},,0,0,0,,{segment.text}"
-            ass_content.append(event)
-        
-        return '\n'.join(ass_content)
+        return SubtitleUtils.build_ass(ass_header, segments)
     
     def _format_ass_time(self, seconds: float) -> str:
         """格式化ASS时间 - 使用统一工具类"""
@@ -266,18 +251,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         Returns:
             str: WebVTT格式内容
         """
-        vtt_content = ["WEBVTT", ""]
-        
-        for i, segment in enumerate(segments, 1):
-            start_time = self._format_vtt_time(segment.start_time)
-            end_time = self._format_vtt_time(segment.end_time)
-            
-            vtt_content.append(f"{i}")
-            vtt_content.append(f"{start_time} --> {end_time}")
-            vtt_content.append(segment.text)
-            vtt_content.append("")
-        
-        return '\n'.join(vtt_content)
+        return SubtitleUtils.build_vtt(segments)
     
     def _format_vtt_time(self, seconds: float) -> str:
         """格式化WebVTT时间 - 使用统一工具类"""
@@ -335,11 +309,22 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         """
         self.logger.info(f"Batch processing {len(requests)} subtitle requests")
         
+        # 统计重复文本（重复项直接命中分割缓存）
+        text_counts = Counter(request.text for request in requests)
+        duplicate_count = len(requests) - len(text_counts)
+        if duplicate_count:
+            self.logger.info(f"{duplicate_count} duplicate subtitle texts will reuse cached splits")
+        
         results = []
         
-        for i, request in enumerate(requests):
+        # 并行处理，结果按请求顺序收集
+        max_workers = self.subtitle_config.get('batch_workers', 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.process_subtitle, request) for request in requests]
+        
+        for i, (request, future) in enumerate(zip(requests, futures)):
             try:
-                segments = self.process_subtitle(request)
+                segments = future.result()
                 results.append(segments)
             except Exception as e:
                 self.logger.error(f"Batch subtitle processing failed for request {i}: {e}")
@@ -354,12 +339,12 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         return results
     
     def get_subtitle_stats(self, segments: List[SubtitleSegment]) -> Dict[str, Any]:
-        """获取字幕统计信息"""
+        """获取字幕统计信息（片段按时间顺序排列，见 _assign_timing）"""
         if not segments:
             return {}
         
-        total_chars = sum(len(segment.text) for segment in segments)
-        total_duration = max(segment.end_time for segment in segments)
+        total_chars = sum(map(len, (segment.text for segment in segments)))
+        total_duration = segments[-1].end_time
         
         return {
             'segment_count': len(segments),
@@ -3,21 +3,165 @@
 专门负责将场景、图像、音频、字幕合成为完整的MP4视频
 支持传统动画和图生视频双模式
 """
+import os
 import re
+import sys
+import hashlib
+import functools
 import subprocess
 import shutil
+import threading
 import logging
 import asyncio
+import atexit
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 from core.config_manager import ConfigManager
 from utils.file_manager import FileManager
-from video.subtitle_engine import SubtitleEngine, SubtitleRequest
+from video.subtitle_engine import SubtitleEngine, SubtitleRequest, SubtitleSegment
 from video.enhanced_animation_processor import EnhancedAnimationProcessor, AnimationRequest
 from media.image_to_video_generator import ImageToVideoGenerator, ImageToVideoRequest
 
 
+# 非标准SRT时间码（小时位数不定、毫秒用'.'分隔或不足3位、后跟坐标信息等）
+_SRT_TIME_RE = re.compile(r'(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})')
+
+# 短于该时长（秒）的场景不单独编码，时长并入相邻场景
+_MIN_SCENE_DURATION = 0.05
+
+# 滤镜图超过该长度时改用 -filter_complex_script（Windows命令行上限约32K字符）
+_FILTER_SCRIPT_THRESHOLD = 8192
+
+# 硬件H.264编码器: video.hwaccel取值 -> (FFmpeg编码器, 编码参数)
+_HW_ENCODERS = {
+    'nvenc': ('h264_nvenc', ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0']),
+    'qsv': ('h264_qsv', ['-preset', 'medium', '-global_quality', '23']),
+    'videotoolbox': ('h264_videotoolbox', ['-b:v', '6M']),
+}
+
+
+# Linux FICLONE ioctl：在支持写时复制的文件系统（btrfs/XFS）上克隆文件而不复制数据
+_FICLONE = 0x40049409
+
+
+def _reflink(src, dst) -> bool:
+    """尝试以reflink方式克隆文件，不支持时返回False"""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        # O_EXCL：绝不截断已存在的目标（它可能是src的硬链接）
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as fdst, open(src, 'rb') as fsrc:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        return False
+
+
+# 尚未删除的视频临时工作目录；进程退出时删除残留目录（中间文件可能位于内存文件系统 /dev/shm）
+_live_temp_dirs = set()
+
+
+@atexit.register
+def _remove_live_temp_dirs():
+    for temp_dir in list(_live_temp_dirs):
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    _live_temp_dirs.clear()
+
+
+_thread_local = threading.local()
+
+# 同步包装方法创建的事件循环；进程退出时统一关闭（线程结束后其循环仍在此保留引用）
+_live_event_loops = set()
+_live_event_loops_lock = threading.Lock()
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """当前线程复用的事件循环（供同步包装方法使用）"""
+    loop = getattr(_thread_local, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_local.loop = loop
+        with _live_event_loops_lock:
+            _live_event_loops.add(loop)
+    return loop
+
+
+@atexit.register
+def _close_event_loops():
+    with _live_event_loops_lock:
+        loops = list(_live_event_loops)
+        _live_event_loops.clear()
+    for loop in loops:
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            # Python 3.9+：等待默认线程池（run_in_executor）中的任务结束
+            shutdown_default_executor = getattr(loop, 'shutdown_default_executor', None)
+            if shutdown_default_executor:
+                loop.run_until_complete(shutdown_default_executor())
+        finally:
+            loop.close()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_ffmpeg() -> Optional[str]:
+    """FFmpeg可执行文件的绝对路径（进程内只查找一次PATH，不启动子进程），未安装时返回None"""
+    return shutil.which('ffmpeg')
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_ffprobe() -> Optional[str]:
+    """FFprobe可执行文件的绝对路径，未安装时返回None"""
+    return shutil.which('ffprobe')
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_encoders(ffmpeg: str) -> frozenset:
+    """FFmpeg支持的编码器名称集合（进程内只探测一次）"""
+    try:
+        result = subprocess.run([ffmpeg, '-hide_banner', '-encoders'],
+                                capture_output=True, text=True)
+    except FileNotFoundError:
+        return frozenset()
+    # 图例之后的编码器列表格式: " V....D h264_nvenc   NVIDIA NVENC H.264 encoder"
+    legend, separator, listing = result.stdout.partition(' ------')
+    return frozenset(
+        fields[1] for fields in map(str.split, (listing if separator else legend).splitlines())
+        if len(fields) >= 2 and len(fields[0]) == 6
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_filters(ffmpeg: str) -> frozenset:
+    """FFmpeg支持的滤镜名称集合（进程内只探测一次）"""
+    try:
+        result = subprocess.run([ffmpeg, '-hide_banner', '-filters'],
+                                capture_output=True, text=True)
+    except FileNotFoundError:
+        return frozenset()
+    # 滤镜列表格式: " T.C ass               V->V       Render ASS subtitles..."（图例行第二列为 "="）
+    return frozenset(
+        fields[1] for fields in map(str.split, result.stdout.splitlines())
+        if len(fields) >= 3 and len(fields[0]) == 3 and fields[1] != '='
+    )
+
+
 class VideoComposer:
     """视频合成器 - 使用FFmpeg合成最终视频"""
     
@@ -45,17 +189,243 @@ class VideoComposer:
         self.animation_strategy = self.config.get('video.animation_strategy', 'traditional')
         self.i2v_config = self.config.get('video.image_to_video', {})
         
-        # 检查FFmpeg是否可用
+        # 可选：将FFmpeg进程固定到可用CPU中编号较高的一半，编号较低的核心留给事件循环与其他任务
+        # （通过 taskset 命令前缀设置，仅Linux支持；Windows/macOS或未安装taskset时该配置不生效）
+        self._ffmpeg_cpuset: Optional[frozenset] = None
+        # FFmpeg/FFprobe命令前缀（固定CPU亲和性时为 taskset -c <cpus>）
+        self._affinity_prefix: List[str] = []
+        if self.config.get('video.ffmpeg_cpu_affinity', False) and hasattr(os, 'sched_getaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+            taskset = shutil.which('taskset')
+            if not taskset:
+                self.logger.warning("video.ffmpeg_cpu_affinity is enabled but taskset was not found, "
+                                    "FFmpeg processes will not be pinned")
+            elif len(cpus) > 1:
+                self._ffmpeg_cpuset = frozenset(cpus[len(cpus) // 2:])
+                self._affinity_prefix = [taskset, '-c', ','.join(map(str, sorted(self._ffmpeg_cpuset)))]
+        # 子进程启动参数：不设置preexec_fn时subprocess可改用posix_spawn启动，
+        # 省去父进程内存较大时fork复制页表的开销；Python 3.13之前还要求close_fds=False
+        # （Python创建的fd默认不可继承，不会泄漏给FFmpeg），3.13起close_fds=True同样可用posix_spawn；
+        # CPU亲和性由taskset在命令中设置而不使用preexec_fn（线程池并发运行时在子进程中执行Python代码不安全）
+        self._spawn_kwargs = {'close_fds': False} if sys.version_info < (3, 13) else {}
+        self.logger.debug(f"FFmpeg subprocesses via posix_spawn: {getattr(subprocess, '_USE_POSIX_SPAWN', False)}")
+        
+        # 场景编码并发：FFmpeg以异步子进程运行，信号量限制同时编码的进程数
+        # （固定CPU时按FFmpeg可用的核心数计算并发与线程数）
+        cpu_count = len(self._ffmpeg_cpuset) if self._ffmpeg_cpuset else (os.cpu_count() or 4)
+        self.max_concurrent_encodes = max(1, int(self.config.get('video.max_concurrent_encodes', cpu_count // 2)))
+        # 每个FFmpeg进程的线程数，默认按并发数均分CPU核心，避免超额订阅
+        self.encode_threads = max(1, int(self.config.get('video.encode_threads', cpu_count // self.max_concurrent_encodes)))
+        # 图生视频请求并发提交，受API速率限制约束
+        self.max_concurrent_i2v = max(1, int(self.i2v_config.get('max_concurrency', 4)))
+        
+        # 传统动画模式下使用单次FFmpeg融合编码（失败时回退到逐场景编码）
+        self.fused_encode = self.config.get('video.fused_encode', True)
+        
+        # 场景片段编码参数（场景编码即输出统一参数，拼接时直接流复制）
+        self.encode_preset = self.config.get('video.encode_preset', 'medium')
+        # 硬件编码: auto(自动检测) / none / nvenc / qsv / videotoolbox
+        self.hwaccel = self.config.get('video.hwaccel', 'auto')
+        self.hw_encoder: Optional[str] = None
+        # 硬件编码器是否已通过实际编码验证（并发编码前串行验证一次）
+        self._hw_encoder_verified = False
+        
+        # 场景视频内容哈希缓存：相同图像+时长+滤镜+编码参数直接复用已编码片段
+        # 缓存位于temp目录下，随临时文件清理一起过期
+        self.scene_cache_enabled = self.config.get('video.scene_cache', False)
+        self._scene_cache_dir = Path(self.file_manager.get_output_path('temp', 'scene_cache'))
+        # 后台进行中的临时目录清理（保持引用直到完成）
+        self._pending_cleanups = set()
+        # 中间文件目录：未配置时位于输出temp目录下；'auto' 表示 /dev/shm 空间充足时使用内存文件系统，
+        # 场景片段、拼接视频等写入后很快被下一步读取的文件不必落盘
+        self.intermediate_dir = self.config.get('video.intermediate_dir')
+        self.intermediate_min_free_mb = int(self.config.get('video.intermediate_min_free_mb', 2048))
+        
+        # 检查FFmpeg是否可用；命令中使用解析后的绝对路径，避免每次启动进程都查找PATH
+        self.ffmpeg = _resolve_ffmpeg() or 'ffmpeg'
+        self.ffprobe = _resolve_ffprobe()
+        # 音频编码探测缓存: (路径, 修改时间) -> 编码名称
+        self._audio_codec_cache = {}
         self._check_ffmpeg()
+        self.subtitle_engine.ffmpeg = self.ffmpeg
+        self.subtitle_engine.ffprobe = self.ffprobe or 'ffprobe'
+        if self.hw_encoder:
+            # 字幕烧录同样是整段视频的重新编码，使用相同的硬件编码器
+            self.subtitle_engine.video_encoder_args = self._scene_encoder_args()
+        # MP4封装参数：默认faststart（moov前置，封装结束后需再搬移一次moov）；
+        # video.fragmented_mp4 为真时输出分片MP4，单次写完无需搬移（部分播放器兼容性较差）
+        if self.config.get('video.fragmented_mp4', False):
+            self._mp4_movflags = '+frag_keyframe+empty_moov+default_base_moof'
+        else:
+            self._mp4_movflags = '+faststart'
+        self.subtitle_engine.mp4_movflags = self._mp4_movflags
+        # FFmpeg未编译libass时不再尝试ass滤镜（每次都会失败后回退），直接使用drawtext渲染；
+        # 无法探测滤镜列表时保持默认行为
+        available_filters = _probe_filters(self.ffmpeg)
+        if available_filters and 'ass' not in available_filters:
+            self.logger.warning("FFmpeg built without libass, subtitles will use drawtext filters")
+            self.subtitle_engine.ass_filter_available = False
+        # 需要重新编码音频时优先使用libfdk_aac（需FFmpeg以 --enable-libfdk-aac 编译），否则使用内置aac
+        if 'libfdk_aac' in _probe_encoders(self.ffmpeg):
+            self._aac_encoder_args = ['libfdk_aac', '-vbr', '4']
+        else:
+            self._aac_encoder_args = ['aac']
     
     def _check_ffmpeg(self):
-        """检查FFmpeg是否可用"""
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+        """检查FFmpeg是否可用（探测结果在进程内缓存，多次创建合成器不重复启动子进程）"""
+        if _resolve_ffmpeg():
             self.logger.info("FFmpeg is available")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        else:
             self.logger.error("FFmpeg not found. Please install FFmpeg first.")
             self.logger.info("Install guide: https://ffmpeg.org/download.html")
+            return
+        
+        # 检查硬件编码器是否可用
+        if self.hwaccel == 'none':
+            return
+        if self.hwaccel == 'auto':
+            candidates = list(_HW_ENCODERS)
+        elif self.hwaccel in _HW_ENCODERS:
+            candidates = [self.hwaccel]
+        else:
+            self.logger.warning(f"Unknown video.hwaccel '{self.hwaccel}', using libx264")
+            return
+        
+        available_encoders = _probe_encoders(self.ffmpeg)
+        for name in candidates:
+            if _HW_ENCODERS[name][0] in available_encoders:
+                self.hw_encoder = name
+                self.logger.info(f"Hardware encoder available, using {_HW_ENCODERS[name][0]}")
+                return
+        
+        if self.hwaccel != 'auto':
+            self.logger.warning(f"Hardware encoder '{self.hwaccel}' not found, falling back to libx264")
+    
+    def _scene_encoder_args(self, intermediate: bool = False) -> List[str]:
+        """
+        场景片段的统一视频编码参数（所有场景一致，拼接时可直接流复制）
+        
+        Args:
+            intermediate: 片段之后还会被字幕渲染重新编码时，使用最快的x264预设
+        """
+        if self.hw_encoder:
+            codec, options = _HW_ENCODERS[self.hw_encoder]
+            return ['-c:v', codec, *options]
+        if intermediate:
+            return ['-c:v', 'libx264', '-crf', '23', '-preset', 'ultrafast']
+        return ['-c:v', 'libx264', '-crf', '20', '-preset', self.encode_preset]
+    
+    async def _verify_hw_encoder(self):
+        """
+        在并发编码开始前串行验证一次硬件编码器
+        
+        编码器列表中存在不代表可用（无GPU/驱动不匹配/会话数已满）；若等到并发编码中途才失败回退，
+        同一视频的场景片段会混用不同编码器，之后无法直接流复制拼接
+        """
+        if not self.hw_encoder or self._hw_encoder_verified:
+            return
+        self._hw_encoder_verified = True
+        cmd = [
+            self.ffmpeg, '-y',
+            '-f', 'lavfi', '-i', 'color=c=black:s=256x256:r=30:d=0.1',
+            *self._scene_encoder_args(),
+            '-pix_fmt', 'yuv420p',
+            '-f', 'null', '-'
+        ]
+        returncode, stderr = await self._run_ffmpeg(cmd)
+        if returncode != 0:
+            self.logger.warning(f"Hardware encoder {_HW_ENCODERS[self.hw_encoder][0]} unusable, using libx264: {stderr}")
+            self.hw_encoder = None
+            self.subtitle_engine.video_encoder_args = None
+    
+    async def _run_encode(self, build_cmd: Callable[[List[str]], List[str]],
+                          intermediate: bool = False) -> Tuple[int, str]:
+        """
+        使用当前视频编码参数执行FFmpeg编码
+        
+        硬件编码失败时（驱动/设备不可用等）关闭硬件编码，使用libx264重试一次
+        
+        Args:
+            build_cmd: 根据编码参数生成完整FFmpeg命令的函数
+            intermediate: 输出是否为中间文件（见 _scene_encoder_args）
+        """
+        encoder_args = self._scene_encoder_args(intermediate)
+        returncode, stderr = await self._run_ffmpeg(build_cmd(encoder_args))
+        if returncode != 0 and encoder_args[1] != 'libx264':
+            self.logger.warning(f"Hardware encoder {encoder_args[1]} failed, falling back to libx264: {stderr}")
+            self.hw_encoder = None
+            self.subtitle_engine.video_encoder_args = None
+            returncode, stderr = await self._run_ffmpeg(build_cmd(self._scene_encoder_args(intermediate)))
+        return returncode, stderr
+    
+    def _mp4_output_args(self) -> List[str]:
+        """
+        输出MP4的封装参数
+        
+        多输入（视频+音频）封装时起始时间不一致的流会在封装队列中积压，
+        加大 max_muxing_queue_size 避免 "Too many packets buffered" 导致整次合成失败
+        """
+        return ['-movflags', self._mp4_movflags, '-max_muxing_queue_size', '1024']
+    
+    async def _probe_audio_codec(self, audio_path: str) -> str:
+        """用ffprobe探测音频文件第一路音频流的编码名称，无法探测时返回空字符串"""
+        if not self.ffprobe:
+            return ''
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._affinity_prefix, self.ffprobe, '-v', 'error', '-select_streams', 'a:0',
+                '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', audio_path,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+                **self._spawn_kwargs
+            )
+            stdout, _ = await process.communicate()
+        except OSError as e:
+            self.logger.debug(f"Failed to probe audio codec: {e}")
+            return ''
+        return stdout.decode('utf-8', 'replace').strip()
+    
+    async def _audio_codec_args(self, audio_path) -> List[str]:
+        """
+        音频编码参数：源音频已是AAC时直接流复制，否则重新编码为AAC（可用时使用libfdk_aac）
+        
+        探测结果按 (路径, 修改时间) 缓存，同一音频多次合成时不重复探测
+        """
+        audio_path = str(audio_path)
+        key = (audio_path, os.stat(audio_path).st_mtime_ns)
+        codec = self._audio_codec_cache.get(key)
+        if codec is None:
+            codec = self._audio_codec_cache[key] = await self._probe_audio_codec(audio_path)
+        if codec == 'aac':
+            return ['-c:a', 'copy']
+        return ['-c:a', *self._aac_encoder_args]
+    
+    async def _run_ffmpeg(self, cmd: List[str]) -> Tuple[int, str]:
+        """
+        以异步子进程执行FFmpeg命令（不阻塞事件循环）
+        
+        stdout直接丢弃；FFmpeg以 -loglevel error -nostats 运行，stderr只包含错误信息，
+        成功的长时间编码不会在管道中积累进度输出，且仅在失败时解码；
+        配置了 video.ffmpeg_cpu_affinity 时通过 taskset 前缀固定CPU亲和性
+        
+        Returns:
+            Tuple[int, str]: (返回码, 失败时的错误输出)
+        """
+        cmd = [*self._affinity_prefix, cmd[0], '-hide_banner', '-nostats', '-loglevel', 'error', *cmd[1:]]
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+            **self._spawn_kwargs
+        )
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            # 任务被取消时结束FFmpeg进程，避免遗留后台编码
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        if process.returncode:
+            return process.returncode, stderr.decode('utf-8', 'replace')
+        return 0, ''
     
     def _should_use_i2v_for_scene(self, scene, scene_index: int) -> bool:
         """
@@ -74,7 +444,9 @@ class VideoComposer:
         # 简化为二选一模式
         return self.animation_strategy == 'image_to_video'
     
-    async def _create_i2v_scene_video(self, scene, image, duration: float, scene_index: int, temp_dir: Path) -> Optional[Path]:
+    async def _create_i2v_scene_video(self, scene, image, duration: float, scene_index: int, temp_dir: Path,
+                                      semaphores: Tuple[asyncio.Semaphore, asyncio.Semaphore],
+                                      intermediate: bool = False) -> Optional[Path]:
         """
         创建图生视频场景视频
         
@@ -84,10 +456,13 @@ class VideoComposer:
             duration: 场景时长
             scene_index: 场景索引
             temp_dir: 临时目录
+            semaphores: 本次合成的 (编码信号量, 图生视频信号量)
+            intermediate: 场景视频之后是否还会被重新编码
         
         Returns:
             Optional[Path]: 生成的视频文件路径
         """
+        encode_semaphore, i2v_semaphore = semaphores
         try:
             self.logger.info(f"Scene {scene_index+1}: Using image-to-video generation")
             
@@ -100,32 +475,33 @@ class VideoComposer:
                 height=1280
             )
             
-            # 生成图生视频
-            i2v_result = await self.i2v_generator.generate_video_async(i2v_request)
+            # 生成图生视频（只限制API请求并发并只重试API请求，重编码由编码信号量控制）
+            i2v_result = await self._generate_i2v_with_retry(i2v_request, i2v_semaphore, scene_index)
             
-            # 将生成的视频复制到临时目录（标准化文件名）
+            # 重编码到临时目录（标准化文件名）：一次完成时长裁剪与编码参数统一
             scene_video = temp_dir / f"scene_{scene_index+1}.mp4"
+            cmd = [self.ffmpeg, '-y']
+            if self.hw_encoder == 'nvenc':
+                # 使用NVDEC解码输入视频（不可用时FFmpeg自动回退到软件解码）
+                cmd += ['-hwaccel', 'cuda']
             
-            # 如果需要调整时长，使用FFmpeg裁剪
+            # 如果需要调整时长，在输入端限制读取时长，FFmpeg只解码所需的数据包
             if abs(duration - i2v_result.duration_seconds) > 0.1:  # 超过0.1秒差异需要调整
                 self.logger.info(f"Adjusting I2V video duration: {i2v_result.duration_seconds}s -> {duration}s")
-                
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-i', i2v_result.video_path,
-                    '-t', str(duration),
-                    '-c', 'copy',  # 不重新编码，直接裁剪
-                    str(scene_video)
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    self.logger.warning(f"Failed to adjust I2V video duration: {result.stderr}")
-                    # 使用原始视频
-                    shutil.copy(i2v_result.video_path, scene_video)
-            else:
-                # 直接复制
-                shutil.copy(i2v_result.video_path, scene_video)
+                cmd += ['-t', str(duration)]
+            cmd += ['-i', i2v_result.video_path]
+            
+            cmd += [
+                '-r', '30',  # 统一帧率
+                '-pix_fmt', 'yuv420p',  # 统一像素格式
+            ]
+            output_args = ['-threads', str(self.encode_threads), str(scene_video)]
+            
+            async with encode_semaphore:
+                returncode, stderr = await self._run_encode(
+                    lambda encoder_args: [*cmd, *encoder_args, *output_args], intermediate)
+            if returncode != 0:
+                raise RuntimeError(f"Failed to encode I2V video: {stderr}")
             
             self.logger.info(f"I2V scene video created: {scene_video}")
             return scene_video
@@ -136,7 +512,50 @@ class VideoComposer:
             # 图生视频失败，抛出异常
             raise
     
-    def _create_traditional_scene_video(self, scene, image, duration: float, scene_index: int, temp_dir: Path) -> Optional[Path]:
+    def _build_scene_animation_filter(self, image, duration: float, scene_index: int) -> str:
+        """
+        生成场景的Ken Burns动画滤镜
+        
+        Args:
+            image: 图像对象
+            duration: 场景时长
+            scene_index: 场景索引
+        
+        Returns:
+            str: FFmpeg滤镜字符串
+        """
+        processor = self.animation_processor
+        width, height = self.width, self.height
+        
+        # 🎬 使用增强动画处理器创建Ken Burns效果
+        animation_request = AnimationRequest(
+            image_path=str(image.file_path),
+            duration_seconds=duration,
+            animation_type="智能选择",
+            is_character=False
+        )
+        
+        # 创建Ken Burns动画
+        animation_clip = processor.create_scene_animation(
+            animation_request, scene_index=scene_index)
+        
+        # 生成增强版FFmpeg滤镜
+        animation_filter = processor.generate_enhanced_ffmpeg_filter(
+            animation_clip, (width, height))
+        
+        self.logger.info(f"Scene {scene_index+1}: Using {animation_clip.animation_type} traditional animation")
+        return animation_filter
+    
+    def _get_scene_cache_file(self, image_path: Path, duration: float, animation_filter: str,
+                              intermediate: bool = False) -> Path:
+        """根据图像内容与编码参数计算场景视频缓存文件路径"""
+        encoder_args = ' '.join(self._scene_encoder_args(intermediate))
+        key_params = f"|{duration}|{animation_filter}|{self.video_resolution}|{encoder_args}"
+        key = hashlib.blake2b(image_path.read_bytes() + key_params.encode('utf-8'), digest_size=16).hexdigest()
+        return self._scene_cache_dir / f"{key}.mp4"
+    
+    async def _create_traditional_scene_video(self, scene, image, duration: float, scene_index: int, temp_dir: Path,
+                                              intermediate: bool = False) -> Optional[Path]:
         """
         创建传统动画场景视频
         
@@ -146,6 +565,7 @@ class VideoComposer:
             duration: 场景时长
             scene_index: 场景索引
             temp_dir: 临时目录
+            intermediate: 场景视频之后是否还会被重新编码
         
         Returns:
             Optional[Path]: 生成的视频文件路径
@@ -153,89 +573,497 @@ class VideoComposer:
         scene_video = temp_dir / f"scene_{scene_index+1}.mp4"
         
         try:
-            # 🎬 使用增强动画处理器创建Ken Burns效果
-            animation_request = AnimationRequest(
-                image_path=str(image.file_path),
-                duration_seconds=duration,
-                animation_type="智能选择",
-                is_character=False
-            )
-            
-            # 创建Ken Burns动画
-            animation_clip = self.animation_processor.create_scene_animation(
-                animation_request, scene_index=scene_index)
-            
-            # 生成增强版FFmpeg滤镜
-            animation_filter = self.animation_processor.generate_enhanced_ffmpeg_filter(
-                animation_clip, (self.width, self.height))
-            
-            # 防御性检查：禁止旧表达式混入
-            if 't/' in animation_filter:
-                self.logger.warning(f"Detected legacy time-based expression in filter; falling back to basic filter for scene {scene_index+1}")
-                animation_filter = f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2"
+            animation_filter = self._build_scene_animation_filter(image, duration, scene_index)
             
-            self.logger.info(f"Scene {scene_index+1}: Using {animation_clip.animation_type} traditional animation")
+            # 命中缓存时直接复制，跳过FFmpeg编码
+            cache_file = None
+            if self.scene_cache_enabled:
+                cache_file = self._get_scene_cache_file(Path(image.file_path), duration, animation_filter, intermediate)
+                if cache_file.exists():
+                    self._fast_copy(cache_file, scene_video)
+                    self.logger.info(f"Scene {scene_index+1}: reused cached video {cache_file.name}")
+                    return scene_video
             
             # 使用增强动画滤镜创建场景视频
             cmd = [
-                'ffmpeg', '-y',
+                self.ffmpeg, '-y',
                 '-loop', '1',
                 '-i', str(image.file_path),
                 '-filter_complex', animation_filter,
                 '-t', str(duration),
+            ]
+            output_args = [
                 '-pix_fmt', 'yuv420p',
                 '-r', '30',
+                '-threads', str(self.encode_threads),
                 str(scene_video)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+            hw_encoder = self.hw_encoder
+            returncode, stderr = await self._run_encode(
+                lambda encoder_args: [*cmd, *encoder_args, *output_args], intermediate)
+            if returncode == 0:
                 self.logger.info(f"Created traditional scene video {scene_index+1}: {scene_video}")
+                # 编码期间硬件编码器已回退时，片段与缓存键中的编码参数不一致，不写入缓存
+                if cache_file is not None and self.hw_encoder == hw_encoder:
+                    self._store_scene_cache(scene_video, cache_file, scene_index)
                 return scene_video
             else:
-                self.logger.error(f"Failed to create traditional scene video {scene_index+1}: {result.stderr}")
+                self.logger.error(f"Failed to create traditional scene video {scene_index+1}: {stderr}")
                 return None
                 
         except Exception as e:
             self.logger.error(f"Traditional animation failed for scene {scene_index+1}: {e}")
             return None
     
-    def _create_fallback_video(self, temp_dir, scene_number, duration, scene_videos):
+    @staticmethod
+    def _fast_copy(src, dst):
+        """
+        复制文件：同一文件系统上创建硬链接（O(1)，不复制数据），其次尝试reflink，最后回退到 shutil.copyfile
+        
+        仅用于之后不会被原地改写的文件（FFmpeg输出总是写入新路径）；已存在的目标先删除再创建，不会原地截断
+        """
+        if os.path.lexists(dst):
+            if os.path.abspath(src) == os.path.abspath(dst):
+                return
+            os.unlink(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            if not _reflink(src, dst):
+                shutil.copyfile(src, dst)
+    
+    def _store_scene_cache(self, scene_video: Path, cache_file: Path, scene_index: int):
+        """将编码完成的场景视频写入缓存（先写临时文件再原子替换，避免并发读到半个文件）"""
+        try:
+            self._scene_cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_name(f"{cache_file.stem}_{os.getpid()}_{scene_index}.tmp")
+            self._fast_copy(scene_video, temp_file)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to cache scene video {scene_index+1}: {e}")
+    
+    async def _create_fallback_video(self, temp_dir, scene_number, duration, scene_videos):
         """创建黑色背景的fallback视频"""
         fallback_video = temp_dir / f"scene_{scene_number}_fallback.mp4"
         cmd_fallback = [
-            'ffmpeg', '-y',
+            self.ffmpeg, '-y',
             '-f', 'lavfi',
             '-i', f'color=c=black:s={self.video_resolution}:d={duration}',
+            '-r', '30',
             '-pix_fmt', 'yuv420p',
-            str(fallback_video)
         ]
-        result = subprocess.run(cmd_fallback, capture_output=True, text=True)
-        if result.returncode == 0:
+        # 黑屏占位片段只需格式兼容，使用最快预设
+        returncode, stderr = await self._run_encode(
+            lambda encoder_args: [*cmd_fallback, *encoder_args, str(fallback_video)], intermediate=True)
+        if returncode == 0:
             scene_videos.append(fallback_video)
             self.logger.info(f"Created fallback video {scene_number}: {fallback_video}")
         else:
-            self.logger.error(f"Failed to create fallback video {scene_number}: {result.stderr}")
+            self.logger.error(f"Failed to create fallback video {scene_number}: {stderr}")
+    
+    async def _create_scene_video_with_retry(self, scene, image, duration: float, scene_index: int, temp_dir: Path,
+                                             semaphores: Tuple[asyncio.Semaphore, asyncio.Semaphore],
+                                             intermediate: bool = False) -> Path:
+        """
+        创建单个场景视频（图生视频/传统动画），图生视频API请求失败时重试
+        
+        传统动画的FFmpeg编码以异步子进程执行，多个场景可同时编码（受信号量限制）；
+        缺少图像或FFmpeg编码失败属于确定性错误，直接失败而不等待重试
+        
+        Args:
+            semaphores: 本次合成的 (编码信号量, 图生视频信号量)
+        
+        Returns:
+            Path: 生成的场景视频路径
+        """
+        i = scene_index
+        image_path = Path(image.file_path) if image and image.file_path else None
+        if not (image_path and image_path.exists()):
+            raise FileNotFoundError(f"No valid image for scene {i+1}")
+        
+        # 判断使用哪种动画模式
+        if not self._should_use_i2v_for_scene(scene, i):
+            # 传统动画模式（异步FFmpeg编码）
+            async with semaphores[0]:
+                scene_video = await self._create_traditional_scene_video(
+                    scene, image, duration, i, temp_dir, intermediate)
+            if scene_video:
+                self.logger.info(f"✅ Traditional animation created for scene {i+1}")
+                return scene_video
+            raise RuntimeError(f"Traditional animation failed for scene {i+1} - no video file created")
+        
+        # 图生视频模式（异步） - 只有远程生成请求会重试，本地重编码失败直接抛出
+        scene_video = await self._create_i2v_scene_video(
+            scene, image, duration, i, temp_dir, semaphores, intermediate)
+        self.logger.info(f"✅ I2V video created for scene {i+1}")
+        return scene_video
+    
+    async def _generate_i2v_with_retry(self, i2v_request: ImageToVideoRequest,
+                                       i2v_semaphore: asyncio.Semaphore, scene_index: int):
+        """
+        调用远程图生视频API，网络请求失败时按指数退避重试
+        
+        参数或文件错误（ValueError/FileNotFoundError）属于确定性错误，直接抛出
+        
+        Returns:
+            图生视频生成结果
+        """
+        i = scene_index
+        max_scene_retries = 3  # 图生视频每个场景最多尝试3次
+        for attempt in range(max_scene_retries):
+            try:
+                if attempt > 0:
+                    self.logger.info(f"🔄 Retrying I2V for scene {i+1}, attempt {attempt + 1}")
+                async with i2v_semaphore:
+                    return await self.i2v_generator.generate_video_async(i2v_request)
+            except (ValueError, FileNotFoundError):
+                raise
+            except Exception as e:
+                if attempt < max_scene_retries - 1:
+                    wait_time = min(2 ** attempt, 8)  # 1s, 2s, 4s...（最多8s）
+                    self.logger.warning(f"⏰ Scene {i+1} attempt {attempt + 1} failed: {e}")
+                    self.logger.info(f"🔄 Retrying scene {i+1} in {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    self.logger.error(f"❌ Scene {i+1} failed after {max_scene_retries} attempts: {e}")
+                    # 最终失败后抛出异常，让上层处理
+                    raise Exception(f"Scene {i+1} generation failed after {max_scene_retries} attempts: {e}")
+    
+    def _drop_degenerate_scenes(self, scenes, images, durations):
+        """
+        去掉时长几乎为0的场景（不产生可见画面，却仍要完整编码一次）
+        
+        被去掉的时长并入前一个保留场景（开头的并入第一个保留场景），总时长不变
+        
+        Returns:
+            Tuple[list, list, list]: (场景, 图像, 时长)
+        """
+        kept = [i for i, duration in enumerate(durations) if duration >= _MIN_SCENE_DURATION]
+        if not kept or len(kept) == len(durations):
+            return scenes, images, durations
+        
+        merged_durations = [durations[i] for i in kept]
+        kept_so_far = 0
+        for duration in durations:
+            if duration >= _MIN_SCENE_DURATION:
+                kept_so_far += 1
+            else:
+                merged_durations[max(kept_so_far - 1, 0)] += duration
+        
+        self.logger.info(f"Skipping {len(durations) - len(kept)} scenes shorter than {_MIN_SCENE_DURATION}s")
+        return [scenes[i] for i in kept], [images[i] for i in kept], merged_durations
+    
+    def _can_use_fused_encode(self, scenes, images) -> bool:
+        """判断是否可以使用单次FFmpeg融合编码（仅传统动画且所有图像可用）"""
+        if not self.fused_encode:
+            return False
+        if len(images) < len(scenes):
+            return False
+        for i, (scene, image) in enumerate(zip(scenes, images)):
+            if self._should_use_i2v_for_scene(scene, i):
+                return False
+            if not (image and image.file_path and Path(image.file_path).exists()):
+                return False
+        return True
+    
+    async def _prepare_fused_subtitles(self, subtitle_future, title_future, use_jianying_style: bool,
+                                       video_duration: float) -> Tuple[List[str], List[str]]:
+        """
+        准备在融合编码或拼接时烧录的字幕滤镜（正文字幕 + 标题字幕）
+        
+        任一层无法生成滤镜（或字幕解析失败）时返回空列表，由后续的字幕步骤单独渲染；
+        调用方将其作为后台任务与场景编码并行执行，只在编码命令需要滤镜时才等待结果
+        
+        Returns:
+            Tuple[List[str], List[str]]: (滤镜列表, 需要在编码后删除的ASS文件列表)
+        """
+        if subtitle_future is None or not use_jianying_style:
+            return [], []
+        
+        subtitle_filters, ass_files = [], []
+        try:
+            # 同时等待正文与标题字幕（任一解析失败时另一个的异常也会被取走）
+            if title_future is not None:
+                subtitle_segments, title_segments = await asyncio.gather(subtitle_future, title_future)
+            else:
+                subtitle_segments, title_segments = await subtitle_future, None
+            
+            layers = [(subtitle_segments, 'jianying')]
+            if title_segments:
+                # 应用标题样式
+                for seg in title_segments:
+                    seg.style = 'title'
+                layers.append((title_segments, 'title'))
+            
+            loop = asyncio.get_running_loop()
+            for segments, style_name in layers:
+                # ASS脚本在线程池中写出，不阻塞事件循环
+                prepared = await loop.run_in_executor(
+                    None, self.subtitle_engine.create_subtitle_filter,
+                    segments, 'jianying', style_name, video_duration)
+                if prepared is None:
+                    break
+                subtitle_filters.append(prepared[0])
+                ass_files.append(prepared[1])
+            else:
+                return subtitle_filters, ass_files
+        except Exception as e:
+            self.logger.warning(f"Failed to prepare burned-in subtitles: {e}")
+        
+        for ass_file in ass_files:
+            Path(ass_file).unlink(missing_ok=True)
+        return [], []
+    
+    async def _create_fused_scene_track(self, images, durations, audio_file, output_video: Path,
+                                        subtitle_task: Optional[Awaitable] = None) -> bool:
+        """
+        单次FFmpeg调用完成场景动画、拼接、音频合成与字幕烧录
+        
+        每个场景图像作为一路 -loop 输入，在同一个filter_complex中完成Ken Burns动画、
+        统一帧率/像素格式并concat，再串接字幕滤镜，H.264只编码一次，不再写出中间文件
+        
+        Args:
+            subtitle_task: _prepare_fused_subtitles 的后台任务；构建完场景滤镜与音频参数后才等待
+        
+        Returns:
+            bool: 是否成功（失败时由调用方回退到多步流程）
+        """
+        cmd = [self.ffmpeg, '-y']
+        filter_parts = []
+        
+        # 循环内使用局部变量，避免每个场景重复查找属性
+        build_filter = self._build_scene_animation_filter
+        add_filter = filter_parts.append
+        
+        for i, (image, duration) in enumerate(zip(images, durations)):
+            animation_filter = build_filter(image, duration, i)
+            cmd += ['-loop', '1', '-t', f'{duration:.3f}', '-i', str(image.file_path)]
+            add_filter(
+                f"[{i}:v]{animation_filter},fps=30,trim=duration={duration:.3f},"
+                f"setpts=PTS-STARTPTS,format=yuv420p,setsar=1[v{i}]"
+            )
+        
+        has_audio = bool(audio_file and Path(audio_file).exists())
+        audio_args = await self._audio_codec_args(audio_file) if has_audio else []
+        
+        # 字幕滤镜在场景滤镜构建期间于后台准备，此处才需要结果
+        subtitle_filters = (await subtitle_task)[0] if subtitle_task is not None else []
+        
+        scene_count = len(filter_parts)
+        if subtitle_filters:
+            filter_parts.append(
+                ''.join(f'[v{i}]' for i in range(scene_count)) + f"concat=n={scene_count}:v=1:a=0[vcat]"
+            )
+            filter_parts.append(f"[vcat]{','.join(subtitle_filters)}[vout]")
+        else:
+            filter_parts.append(
+                ''.join(f'[v{i}]' for i in range(scene_count)) + f"concat=n={scene_count}:v=1:a=0[vout]"
+            )
+        
+        if has_audio:
+            cmd += ['-i', str(audio_file)]
+        
+        script_file = output_video.with_name(f"{output_video.stem}_filter.txt")
+        cmd += self._filter_complex_args(';'.join(filter_parts), script_file)
+        cmd += ['-map', '[vout]']
+        if has_audio:
+            cmd += ['-map', f'{scene_count}:a', *audio_args, '-shortest']
+        
+        output_args = [
+            '-r', '30',
+            '-pix_fmt', 'yuv420p',
+            *self._mp4_output_args(),
+            str(output_video)
+        ]
+        
+        self.logger.info(f"Fused encode: {scene_count} scenes in a single FFmpeg pass")
+        try:
+            returncode, stderr = await self._run_encode(
+                lambda encoder_args: [*cmd, *encoder_args, *output_args])
+        finally:
+            script_file.unlink(missing_ok=True)
+        if returncode == 0:
+            self.logger.info(f"Fused scene track created: {output_video}")
+            return True
+        
+        self.logger.warning(f"Fused encode failed, falling back to per-scene encoding: {stderr}")
+        return False
+    
+    @staticmethod
+    def _concat_entry(path: str) -> str:
+        """
+        生成concat列表中的一行
+        
+        单引号内的字符（包括Windows路径中的反斜杠）按原样解析，只有单引号本身需要写成 '\\''
+        """
+        escaped_path = path.replace("'", "'\\''")
+        return f"file '{escaped_path}'\n"
+    
+    @staticmethod
+    def _filter_complex_args(filter_graph: str, script_file: Path) -> List[str]:
+        """
+        生成滤镜图参数：过长的滤镜图写入脚本文件，避免命令行超出系统长度限制
+        
+        Args:
+            filter_graph: 滤镜图字符串
+            script_file: 滤镜图过长时写入的脚本文件（由调用方在编码后删除）
+        """
+        if len(filter_graph) <= _FILTER_SCRIPT_THRESHOLD:
+            return ['-filter_complex', filter_graph]
+        script_file.write_text(filter_graph, encoding='utf-8')
+        return ['-filter_complex_script', str(script_file)]
+    
+    async def _create_scene_track_multipass(self, scenes, images, durations, audio_file,
+                                            temp_dir: Path, video_with_audio: Path,
+                                            semaphores: Tuple[asyncio.Semaphore, asyncio.Semaphore],
+                                            subtitle_task: Optional[Awaitable] = None,
+                                            intermediate: bool = False) -> Tuple[bool, bool]:
+        """
+        多步流程：逐场景编码 → 拼接并添加音频（可同时烧录字幕）
+        
+        场景编码直接输出统一的帧率/像素格式/编码参数（图生视频片段在裁剪时一并重编码），
+        拼接时可直接流复制，不再需要单独的标准化重编码
+        
+        Args:
+            semaphores: 本次合成的 (编码信号量, 图生视频信号量)
+            subtitle_task: _prepare_fused_subtitles 的后台任务，场景编码完成后才等待其结果
+                （得到的滤镜在拼接时烧录，为空时视频流直接复制）
+            intermediate: 之后是否还会重新编码（是则场景片段使用最快预设）
+        
+        Returns:
+            Tuple[bool, bool]: (是否成功生成 video_with_audio, 字幕是否已烧录)
+        """
+        # 第1步: 为每个场景创建视频片段（支持双模式）
+        # 所有场景并发生成（结果按场景顺序返回）- 每个场景支持重试
+        hw_encoder = self.hw_encoder
+        tasks = [
+            asyncio.ensure_future(self._create_scene_video_with_retry(
+                scene, image, duration, i, temp_dir, semaphores, intermediate))
+            for i, (scene, image, duration) in enumerate(zip(scenes, images, durations))
+        ]
+        if not tasks:
+            self.logger.error("No scene videos created")
+            return False, False
+        
+        # 任一场景重试耗尽即整体失败：取消其余场景（连同其FFmpeg进程），不再等待无用的编码
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        errors = [task.exception() for task in tasks if not task.cancelled() and task.exception()]
+        if errors:
+            self.logger.error(f"{len(errors)}/{len(tasks)} scene videos failed, cancelled {len(pending)} pending scenes")
+            raise errors[0]
+        scene_videos = [task.result() for task in tasks]
+        
+        # 场景编码期间硬件编码器回退到libx264时，片段混用了不同编码器，拼接时不能直接流复制
+        mixed_encoders = self.hw_encoder != hw_encoder
+        if mixed_encoders:
+            self.logger.warning("Scene clips were encoded with different encoders, re-encoding while merging")
+        
+        async def run_merge(cmd: List[str], output_args: List[str]) -> Tuple[int, str]:
+            if mixed_encoders:
+                return await self._run_encode(
+                    lambda encoder_args: [*cmd, *encoder_args, '-pix_fmt', 'yuv420p', *output_args])
+            return await self._run_ffmpeg([*cmd, '-c:v', 'copy', *output_args])
+        
+        # 第2步: 拼接场景视频（编码参数已统一）
+        # 所有片段都在temp_dir下：只解析一次目录路径，一次性写出列表
+        concat_file = temp_dir / 'concat_list.txt'
+        temp_dir_abs = os.fspath(temp_dir.resolve())
+        concat_content = ''.join(self._concat_entry(f"{temp_dir_abs}{os.sep}{video.name}") for video in scene_videos)
+        # 在线程池中写文件，避免慢速临时目录阻塞事件循环
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(concat_file.write_text, concat_content, encoding='utf-8'))
+        
+        # 第3步: 拼接与添加音频在同一次FFmpeg调用中完成（不写出中间拼接文件）
+        cmd_concat = [
+            self.ffmpeg, '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(concat_file),
+        ]
+        has_audio = bool(audio_file and Path(audio_file).exists())
+        
+        # 字幕滤镜在场景编码期间于后台准备
+        subtitle_filters = (await subtitle_task)[0] if subtitle_task is not None else []
+        if subtitle_filters:
+            # 字幕在同一次调用中烧录：拼接后的画面只编码一次，不再单独执行字幕渲染
+            cmd_burn = list(cmd_concat)
+            if has_audio:
+                cmd_burn += ['-i', str(audio_file)]
+            cmd_burn += ['-filter_complex', f"[0:v]{','.join(subtitle_filters)}[vout]", '-map', '[vout]']
+            if has_audio:
+                cmd_burn += ['-map', '1:a', *await self._audio_codec_args(audio_file), '-shortest']
+            output_args = ['-r', '30', '-pix_fmt', 'yuv420p', *self._mp4_output_args(), str(video_with_audio)]
+            
+            returncode, stderr = await self._run_encode(
+                lambda encoder_args: [*cmd_burn, *encoder_args, *output_args])
+            if returncode == 0:
+                self.logger.info("Scenes merged with audio and burned-in subtitles")
+                return True, True
+            self.logger.warning(f"Failed to burn subtitles while merging, merging without subtitles: {stderr}")
+        
+        if has_audio:
+            cmd_audio = cmd_concat + [
+                '-i', str(audio_file),
+                '-map', '0:v',
+                '-map', '1:a',
+                *await self._audio_codec_args(audio_file),
+                '-shortest',  # 使用较短的流长度，避免音视频不同步
+            ]
+            
+            # 编码参数已统一时视频流直接复制
+            returncode, stderr = await run_merge(cmd_audio, [*self._mp4_output_args(), str(video_with_audio)])
+            if returncode == 0:
+                self.logger.info("Audio added successfully")
+                return True, False
+            self.logger.warning(f"Failed to add audio: {stderr}")
+        else:
+            self.logger.info("No audio file, using silent video")
+        
+        returncode, stderr = await run_merge(cmd_concat, [*self._mp4_output_args(), str(video_with_audio)])
+        if returncode != 0:
+            self.logger.error(f"Failed to merge scene videos: {stderr}")
+            return False, False
+        
+        return True, False
     
     async def create_video(self, scenes, images, audio_file, subtitle_file, output_path, 
                     audio_duration=None, title_subtitle_file=None, use_jianying_style=True,
-                    character_images=None, integrated_mode=False):
-        """创建视频文件 - 支持一体化模式（预生成视频+角色图像）"""
+                    character_images=None, integrated_mode=False,
+                    subtitle_segments=None, title_segments=None):
+        """
+        创建视频文件 - 支持一体化模式（预生成视频+角色图像）
+        
+        subtitle_segments / title_segments 为上游已生成的字幕段落（字幕处理器或统一字幕引擎的段落均可），
+        传入时直接使用，不再从 subtitle_file / title_subtitle_file 重新解析SRT（标题字幕仅传统模式）
+        """
+        temp_dir = None
+        if subtitle_segments is not None:
+            subtitle_segments = self._to_engine_segments(subtitle_segments)
+        if title_segments is not None:
+            title_segments = self._to_engine_segments(title_segments)
         try:
             # 创建唯一临时工作目录（避免并发冲突）
             import uuid
             unique_id = str(uuid.uuid4())[:8]
-            temp_dir = self.file_manager.get_output_path('temp', f'video_creation_{unique_id}')
-            temp_dir = Path(temp_dir)
+            temp_dir = self._intermediate_path(f'video_creation_{unique_id}')
             temp_dir.mkdir(parents=True, exist_ok=True)
+            _live_temp_dirs.add(temp_dir)
             self.logger.debug(f"Created unique temp directory: {temp_dir}")
+            output_path = Path(output_path)
             
             # 一体化模式处理：images参数包含预生成的视频文件
             if integrated_mode:
                 self.logger.info("🎬 使用一体化模式：角色图像+预生成场景视频")
                 return await self._create_video_integrated_mode(
                     scenes, images, character_images, audio_file, subtitle_file, 
-                    output_path, temp_dir, audio_duration, use_jianying_style
+                    output_path, temp_dir, audio_duration, use_jianying_style,
+                    subtitle_segments
                 )
             
             # 传统模式处理
@@ -245,167 +1073,102 @@ class VideoComposer:
             if not audio_duration or audio_duration <= 0:
                 raise ValueError("❌ 音频文件是必需的！原始Coze工作流要求按音频片段时长分配场景时长，没有音频无法正确生成视频。")
             
+            # 字幕解析在后台线程中进行，与下面的FFmpeg场景编码重叠（已传入段落时跳过SRT解析）
+            loop = asyncio.get_running_loop()
+            subtitle_future = None
+            if subtitle_segments is not None:
+                subtitle_future = loop.create_future()
+                subtitle_future.set_result(subtitle_segments)
+            elif subtitle_file and Path(subtitle_file).exists():
+                subtitle_future = loop.run_in_executor(None, self._load_subtitles_from_srt, subtitle_file)
+            title_future = None
+            if title_segments is not None:
+                title_future = loop.create_future()
+                title_future.set_result(title_segments)
+            elif title_subtitle_file and Path(title_subtitle_file).exists():
+                title_future = loop.run_in_executor(None, self._load_subtitles_from_srt, title_subtitle_file)
+            
             # TODO: 🚧 当前是错误的按总音频时长+字符占比分配的逻辑
             # 正确的逻辑应该是：按每个音频片段的实际时长分配对应场景的时长
             # 需要从音频生成阶段获取每个音频片段的duration_list
             
             # 临时使用字符占比分配（待重构为按音频片段时长分配）
-            total_chars = sum(len(scene.content) for scene in scenes)
-            actual_scene_durations = []
+            char_counts = list(map(len, map(attrgetter('content'), scenes)))
+            total_chars = sum(char_counts)
+            if total_chars > 0:
+                scale = audio_duration / total_chars
+                actual_scene_durations = [count * scale for count in char_counts]
+            else:
+                actual_scene_durations = [audio_duration / len(scenes)] * len(scenes)
             
-            for scene in scenes:
-                if total_chars > 0:
-                    char_weight = len(scene.content) / total_chars
-                    scene_duration = audio_duration * char_weight
-                else:
-                    scene_duration = audio_duration / len(scenes)
-                actual_scene_durations.append(scene_duration)
-                
             self.logger.warning(f"⚠️  当前使用临时的字符占比分配: {[f'{d:.1f}s' for d in actual_scene_durations]}")
             self.logger.warning("🚧 需要重构为按音频片段时长分配的正确逻辑")
             
-            # 第1步: 为每个场景创建视频片段（支持双模式）
-            scene_videos = []
-            
-            # 混合异步/同步处理：图生视频用异步，传统动画用同步 - 每个场景支持重试
-            for i, (scene, image, duration) in enumerate(zip(scenes, images, actual_scene_durations)):
-                scene_video = None
-                max_scene_retries = 3  # 每个场景最多重试3次
-                
-                for attempt in range(max_scene_retries):
-                    try:
-                        if image and image.file_path and Path(image.file_path).exists():
-                            # 判断使用哪种动画模式
-                            use_i2v = self._should_use_i2v_for_scene(scene, i)
-                            
-                            if use_i2v:
-                                # 图生视频模式（异步） - 依赖重试机制
-                                if attempt > 0:
-                                    self.logger.info(f"🔄 Retrying I2V for scene {i+1}, attempt {attempt + 1}")
-                                scene_video = await self._create_i2v_scene_video(scene, image, duration, i, temp_dir)
-                                if scene_video and scene_video.exists():
-                                    scene_videos.append(scene_video)
-                                    self.logger.info(f"✅ I2V video created for scene {i+1} (attempt {attempt + 1})")
-                                    break
-                                else:
-                                    raise Exception(f"I2V video generation failed for scene {i+1} - no video file created")
-                            else:
-                                # 传统动画模式（同步）
-                                if attempt > 0:
-                                    self.logger.info(f"🔄 Retrying traditional animation for scene {i+1}, attempt {attempt + 1}")
-                                scene_video = self._create_traditional_scene_video(scene, image, duration, i, temp_dir)
-                                if scene_video and scene_video.exists():
-                                    scene_videos.append(scene_video)
-                                    self.logger.info(f"✅ Traditional animation created for scene {i+1} (attempt {attempt + 1})")
-                                    break
-                                else:
-                                    raise Exception(f"Traditional animation failed for scene {i+1} - no video file created")
-                        else:
-                            raise Exception(f"No valid image for scene {i+1}")
-                            
-                    except Exception as e:
-                        if attempt < max_scene_retries - 1:
-                            wait_time = (attempt + 1) * 10  # 10s, 20s, 30s...
-                            self.logger.warning(f"⏰ Scene {i+1} attempt {attempt + 1} failed: {e}")
-                            self.logger.info(f"🔄 Retrying scene {i+1} in {wait_time}s...")
-                            await asyncio.sleep(wait_time)
-                        else:
-                            self.logger.error(f"❌ Scene {i+1} failed after {max_scene_retries} attempts: {e}")
-                            # 最终失败后抛出异常，让上层处理
-                            raise Exception(f"Scene {i+1} generation failed after {max_scene_retries} attempts: {e}")
-            
-            if not scene_videos:
-                self.logger.error("No scene videos created")
-                return None
+            if len(images) >= len(scenes):
+                scenes, images, actual_scene_durations = self._drop_degenerate_scenes(
+                    scenes, images, actual_scene_durations)
             
-            # 第2步: 统一编码参数后拼接场景视频
-            self.logger.info("Normalizing video segments for consistent encoding...")
-            
-            # 先将所有片段重编码为统一参数
-            normalized_videos = []
-            for i, video in enumerate(scene_videos):
-                normalized_video = temp_dir / f'normalized_scene_{i+1}.mp4'
-                cmd_normalize = [
-                    'ffmpeg', '-y',
-                    '-i', str(video),
-                    '-r', '30',  # 统一帧率
-                    '-pix_fmt', 'yuv420p',  # 统一像素格式
-                    '-c:v', 'libx264',  # 统一编码器
-                    '-crf', '20',  # 统一质量
-                    '-preset', 'medium',  # 编码速度
-                    str(normalized_video)
-                ]
-                
-                result = subprocess.run(cmd_normalize, capture_output=True, text=True)
-                if result.returncode == 0:
-                    normalized_videos.append(normalized_video)
-                    self.logger.debug(f"Normalized scene {i+1} video")
-                else:
-                    self.logger.error(f"Failed to normalize scene {i+1} video: {result.stderr}")
-                    return None
-            
-            # 拼接标准化后的视频
-            concat_file = temp_dir / 'concat_list.txt'
-            with open(concat_file, 'w') as f:
-                for video in normalized_videos:
-                    f.write(f"file '{video.absolute()}'\n")
-            
-            merged_video = temp_dir / 'merged_video.mp4'
-            cmd_concat = [
-                'ffmpeg', '-y',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', str(concat_file),
-                '-c', 'copy',  # 现在可以安全使用copy，因为参数已统一
-                str(merged_video)
-            ]
-            
-            result = subprocess.run(cmd_concat, capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to merge normalized videos: {result.stderr}")
-                return None
-            
-            # 第3步: 添加音频（使用音频时长）
+            # 第1-3步: 场景动画 + 拼接 + 音频（可用时同时烧录字幕，最终画面只编码一次）
+            await self._verify_hw_encoder()
             video_with_audio = temp_dir / 'video_with_audio.mp4'
-            if audio_file and Path(audio_file).exists():
-                cmd_audio = [
-                    'ffmpeg', '-y',
-                    '-i', str(merged_video),
-                    '-i', str(audio_file),
-                    '-c:v', 'copy',
-                    '-c:a', 'aac',
-                    '-shortest',  # 使用较短的流长度，避免音视频不同步
-                    str(video_with_audio)
-                ]
+            # 字幕滤镜在后台准备（等待解析结果、写出ASS），与场景滤镜构建/场景编码重叠
+            subtitle_task = asyncio.ensure_future(self._prepare_fused_subtitles(
+                subtitle_future, title_future, use_jianying_style, audio_duration
+            ))
+            # 场景片段是否按中间文件（最快预设）编码：只有确实还会重新编码整段画面时才降低片段质量
+            clips_intermediate = False
+            try:
+                fused = False
+                subtitles_burned = False
+                if self._can_use_fused_encode(scenes, images):
+                    # 🚀 单次FFmpeg调用完成全部场景编码、拼接、音频合成与字幕烧录
+                    fused = await self._create_fused_scene_track(
+                        images, actual_scene_durations, audio_file, video_with_audio, subtitle_task
+                    )
+                    subtitles_burned = fused and bool((await subtitle_task)[0])
                 
-                result = subprocess.run(cmd_audio, capture_output=True, text=True)
-                if result.returncode == 0:
-                    self.logger.info("Audio added successfully")
-                else:
-                    self.logger.warning(f"Failed to add audio: {result.stderr}")
-                    shutil.copy(merged_video, video_with_audio)
-            else:
-                self.logger.info("No audio file, using silent video")
-                shutil.copy(merged_video, video_with_audio)
+                if not fused:
+                    # 拼接时烧录字幕或之后由字幕引擎重新编码时，场景片段只是中间文件；
+                    # 字幕为空（或解析失败）时不会再编码，片段即按最终参数编码
+                    clips_intermediate = subtitle_future is not None and bool(await subtitle_future)
+                    # 信号量随每次合成创建，绑定当前运行的事件循环
+                    semaphores = (asyncio.Semaphore(self.max_concurrent_encodes),
+                                  asyncio.Semaphore(self.max_concurrent_i2v))
+                    success, subtitles_burned = await self._create_scene_track_multipass(
+                        scenes, images, actual_scene_durations, audio_file, temp_dir, video_with_audio,
+                        semaphores, subtitle_task, intermediate=clips_intermediate)
+                    if not success:
+                        return None
+            finally:
+                _, ass_files = await subtitle_task
+                for ass_file in ass_files:
+                    Path(ass_file).unlink(missing_ok=True)
             
             # 第4步: 使用统一字幕引擎添加字幕
             subtitle_applied = False
             
-            if subtitle_file and Path(subtitle_file).exists():
+            if subtitles_burned:
+                # 字幕已在融合编码中烧录
+                shutil.move(video_with_audio, output_path)
+                subtitle_applied = True
+                self.logger.info("✅ Subtitles burned in during fused encode")
+            elif subtitle_future is not None:
                 try:
                     # 🎯 使用统一字幕引擎
                     self.logger.info("Applying subtitles with unified subtitle engine...")
                     
-                    # 从SRT文件加载字幕段落
-                    subtitle_segments = self._load_subtitles_from_srt(subtitle_file)
+                    # 获取后台解析的字幕段落
+                    subtitle_segments = await subtitle_future
                     
                     if subtitle_segments:
                         # 选择渲染风格
                         renderer_name = 'jianying' if use_jianying_style else 'traditional'
                         style_name = 'jianying' if use_jianying_style else 'main'
                         
-                        # 使用统一引擎渲染
-                        success = self.subtitle_engine.render_to_video(
+                        # 使用统一引擎渲染（阻塞的FFmpeg调用放到线程池，避免卡住事件循环）
+                        success = await loop.run_in_executor(
+                            None,
+                            self.subtitle_engine.render_to_video,
                             str(video_with_audio),
                             subtitle_segments,
                             str(output_path),
@@ -423,23 +1186,25 @@ class VideoComposer:
                     self.logger.error(f"Unified subtitle engine failed: {e}")
             
             # 添加标题字幕（如果有）
-            if subtitle_applied and title_subtitle_file and Path(title_subtitle_file).exists():
+            if subtitle_applied and not subtitles_burned and title_future is not None:
                 try:
                     self.logger.info("Adding title subtitles...")
                     # 标题字幕需要叠加到已有字幕视频上
-                    temp_output = str(Path(output_path).with_suffix('.temp.mp4'))
+                    temp_output = output_path.with_suffix('.temp.mp4')
                     
-                    title_segments = self._load_subtitles_from_srt(title_subtitle_file)
+                    title_segments = await title_future
                     if title_segments:
                         # 应用标题样式
                         for seg in title_segments:
                             seg.style = 'title'
                         
                         # 渲染标题字幕
-                        title_success = self.subtitle_engine.render_to_video(
+                        title_success = await loop.run_in_executor(
+                            None,
+                            self.subtitle_engine.render_to_video,
                             str(output_path),
                             title_segments, 
-                            temp_output,
+                            str(temp_output),
                             'jianying',  # 标题也使用剪映风格
                             'title'
                         )
@@ -451,25 +1216,22 @@ class VideoComposer:
                         else:
                             self.logger.warning("Failed to add title subtitles")
                             # 清理临时文件
-                            if Path(temp_output).exists():
-                                Path(temp_output).unlink()
+                            temp_output.unlink(missing_ok=True)
                 
                 except Exception as e:
                     self.logger.error(f"Title subtitle processing failed: {e}")
             
-            # 如果字幕处理失败，复制无字幕视频
+            # 如果字幕处理失败，使用无字幕视频（临时文件随后删除，直接移动）
             if not subtitle_applied:
-                self.logger.info("No subtitles applied, copying video without subtitles")
-                shutil.copy(video_with_audio, output_path)
-            
-            # 清理临时文件
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                self.logger.warning(f"Failed to clean temp directory: {e}")
+                # 硬件编码器不区分中间文件参数，只有libx264编码的中间片段需要按最终参数重新编码
+                reencoded = (clips_intermediate and not self.hw_encoder
+                             and await self._reencode_final(video_with_audio, output_path))
+                if not reencoded:
+                    self.logger.info("No subtitles applied, moving video without subtitles")
+                    shutil.move(video_with_audio, output_path)
             
-            if Path(output_path).exists():
-                file_size = Path(output_path).stat().st_size / 1024 / 1024  # MB
+            if output_path.exists():
+                file_size = output_path.stat().st_size / 1024 / 1024  # MB
                 self.logger.info(f"Video created successfully: {output_path} ({file_size:.1f} MB)")
                 return str(output_path)
             else:
@@ -480,36 +1242,147 @@ class VideoComposer:
             import traceback
             traceback.print_exc()
             return None
+        finally:
+            # 清理临时文件（一体化/传统模式及失败路径）：在线程池中后台删除，不阻塞结果返回
+            if temp_dir is not None:
+                cleanup = asyncio.get_running_loop().run_in_executor(None, self._remove_temp_dir, temp_dir)
+                self._pending_cleanups.add(cleanup)
+                cleanup.add_done_callback(self._pending_cleanups.discard)
+    
+    async def _reencode_final(self, input_video: Path, output_path: Path) -> bool:
+        """
+        按最终编码参数重新编码视频流（音频流直接复制）
+        
+        场景片段按中间文件编码、之后的字幕渲染却未能执行时使用，避免以最快预设的画质交付
+        
+        Returns:
+            bool: 是否编码成功（失败时调用方直接使用原视频）
+        """
+        self.logger.info("No subtitles applied, re-encoding intermediate scene clips at final settings")
+        cmd = [self.ffmpeg, '-y', '-i', str(input_video)]
+        output_args = ['-pix_fmt', 'yuv420p', '-c:a', 'copy', *self._mp4_output_args(), str(output_path)]
+        returncode, stderr = await self._run_encode(
+            lambda encoder_args: [*cmd, *encoder_args, *output_args])
+        if returncode == 0:
+            return True
+        self.logger.warning(f"Final re-encode failed, using intermediate-quality video: {stderr}")
+        return False
+    
+    @staticmethod
+    def _to_engine_segments(segments) -> List[SubtitleSegment]:
+        """
+        将上游字幕段落转换为统一字幕引擎的 SubtitleSegment
+        
+        字幕对齐结果使用字幕处理器的 SubtitleSegment（字段为引擎版本的子集）；
+        总是构造新对象，之后修改样式不会影响调用方的段落
+        """
+        return [
+            SubtitleSegment(
+                text=segment.text,
+                start_time=segment.start_time,
+                end_time=segment.end_time,
+                duration=segment.duration,
+                style=segment.style,
+                position=segment.position
+            )
+            for segment in segments
+        ]
+    
+    def _intermediate_path(self, name: str) -> Path:
+        """
+        中间文件路径
+        
+        video.intermediate_dir 为 'auto' 时，/dev/shm 存在且剩余空间不少于
+        video.intermediate_min_free_mb 才使用内存文件系统，否则回退到输出temp目录
+        """
+        if self.intermediate_dir == 'auto':
+            shm = Path('/dev/shm')
+            if shm.is_dir() and shutil.disk_usage(shm).free >= self.intermediate_min_free_mb * 1024 * 1024:
+                return shm / 'story_video' / name
+            self.logger.debug("/dev/shm unavailable or low on space, using output temp directory")
+        elif self.intermediate_dir:
+            return Path(self.intermediate_dir) / name
+        return Path(self.file_manager.get_output_path('temp', name))
+    
+    def _remove_temp_dir(self, temp_dir: Path):
+        """删除临时工作目录（在线程池中执行）"""
+        try:
+            shutil.rmtree(temp_dir)
+        except Exception as e:
+            self.logger.warning(f"Failed to clean temp directory: {e}")
+        finally:
+            _live_temp_dirs.discard(temp_dir)
+    
+    @staticmethod
+    def _iter_srt_blocks(lines: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+        """
+        逐行扫描SRT内容，按字幕块产出 (时间轴行, 文本行列表)
+        
+        状态为"等待时间轴"或"收集文本行"：序号行在遇到时间轴前被跳过，空行结束当前字幕块
+        """
+        timing_line = None
+        text_lines = []
+        
+        for line in lines:
+            line = line.strip()
+            
+            if timing_line is None:
+                if ' --> ' in line:
+                    timing_line = line
+            elif line:
+                text_lines.append(line)
+            else:
+                yield timing_line, text_lines
+                timing_line = None
+                text_lines = []
+        
+        # 文件末尾没有空行时提交最后一个字幕块
+        if timing_line is not None:
+            yield timing_line, text_lines
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _read_srt_entries(srt_file: str, mtime_ns: int, size: int) -> Tuple[Tuple[str, float, float], ...]:
+        """
+        按行流式解析SRT文件为 (文本, 开始时间, 结束时间) 元组
+        
+        以 (路径, 修改时间, 大小) 为键缓存，文件未变化时重复加载不再解析；
+        缓存不可变元组，调用方每次构造新的字幕段落对象，后续修改段落不会影响缓存
+        """
+        entries = []
+        with open(srt_file, 'r', encoding='utf-8', errors='replace') as f:
+            for timing_line, text_lines in VideoComposer._iter_srt_blocks(f):
+                if not text_lines:
+                    continue
+                start_time_str, _, end_time_str = timing_line.partition(' --> ')
+                try:
+                    start_time = VideoComposer._parse_srt_time(start_time_str)
+                    end_time = VideoComposer._parse_srt_time(end_time_str)
+                except ValueError as e:
+                    # 单个时间轴无法解析时只跳过该字幕块，不丢弃整个文件
+                    logging.getLogger('story_generator.video').warning(
+                        f"Skipping SRT cue with invalid timing in {srt_file}: {e}")
+                    continue
+                entries.append(('\n'.join(text_lines), start_time, end_time))
+        return tuple(entries)
     
     def _load_subtitles_from_srt(self, srt_file: str) -> List:
-        """从SRT文件加载字幕段落"""
+        """从SRT文件加载字幕段落（解析结果按文件状态缓存）"""
         try:
             # 导入统一字幕引擎的数据结构
             from video.subtitle_engine import SubtitleSegment
             
-            with open(srt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 解析SRT格式
-            srt_pattern = r'(\d+)\s*\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\s*\n(.*?)\n\n'
-            matches = re.findall(srt_pattern, content, re.DOTALL)
-            
-            segments = []
-            for match in matches:
-                sequence, start_time_str, end_time_str, text = match
-                
-                # 解析时间
-                start_time = self._parse_srt_time(start_time_str)
-                end_time = self._parse_srt_time(end_time_str)
-                duration = end_time - start_time
-                
-                segment = SubtitleSegment(
-                    text=text.strip(),
+            stat = os.stat(srt_file)
+            segments = [
+                SubtitleSegment(
+                    text=text,
                     start_time=start_time,
                     end_time=end_time,
-                    duration=duration
+                    duration=end_time - start_time
                 )
-                segments.append(segment)
+                for text, start_time, end_time in self._read_srt_entries(
+                    os.fspath(srt_file), stat.st_mtime_ns, stat.st_size)
+            ]
             
             self.logger.info(f"Loaded {len(segments)} subtitle segments from SRT")
             return segments
@@ -518,31 +1391,37 @@ class VideoComposer:
             self.logger.error(f"Failed to load SRT file: {e}")
             return []
     
-    def _parse_srt_time(self, time_str: str) -> float:
-        """解析SRT时间格式为秒数"""
-        # 格式: "00:02:30,500"
-        time_parts = time_str.replace(',', '.').split(':')
-        hours = int(time_parts[0])
-        minutes = int(time_parts[1])
-        seconds = float(time_parts[2])
+    @staticmethod
+    def _parse_srt_time(time_str: str) -> float:
+        """解析SRT时间格式为秒数（标准格式 HH:MM:SS,mmm 按位置切片，其余格式用预编译正则）"""
+        # 格式: "00:02:30,500"（分隔符不在标准位置的12字符时间码交给正则解析）
+        if len(time_str) == 12 and time_str[2] == ':' and time_str[5] == ':' and time_str[8] in ',.':
+            return (int(time_str[0:2]) * 3600 + int(time_str[3:5]) * 60
+                    + int(time_str[6:8]) + int(time_str[9:12]) / 1000)
         
-        return hours * 3600 + minutes * 60 + seconds
+        match = _SRT_TIME_RE.match(time_str.strip())
+        if not match:
+            raise ValueError(f"Invalid SRT time: {time_str!r}")
+        hours, minutes, seconds, millis = match.groups()
+        return (int(hours) * 3600 + int(minutes) * 60
+                + int(seconds) + int(millis.ljust(3, '0')) / 1000)
     
     def create_video_sync(self, scenes, images, audio_file, subtitle_file, output_path, 
                          audio_duration=None, title_subtitle_file=None, use_jianying_style=True):
         """
         同步创建视频（对异步方法的包装）
         
-        保持向后兼容性
+        保持向后兼容性。使用当前线程复用的事件循环，多次调用时不必为每个视频重新创建/销毁循环
+        （循环在进程退出时关闭）
         """
-        return asyncio.run(self.create_video(
+        return _get_event_loop().run_until_complete(self.create_video(
             scenes, images, audio_file, subtitle_file, output_path,
             audio_duration, title_subtitle_file, use_jianying_style
         ))
     
     async def _create_video_integrated_mode(self, scenes, scene_videos, character_images, 
                                           audio_file, subtitle_file, output_path, temp_dir, 
-                                          audio_duration, use_jianying_style):
+                                          audio_duration, use_jianying_style, subtitle_segments=None):
         """
         一体化模式：直接使用预生成的场景视频+角色图像作为首帧
         
@@ -556,10 +1435,20 @@ class VideoComposer:
             temp_dir: 临时目录
             audio_duration: 音频时长
             use_jianying_style: 是否使用剪映风格字幕
+            subtitle_segments: 上游已生成的字幕段落，传入时不再解析 subtitle_file
         """
         try:
             self.logger.info(f"一体化模式视频合成: {len(scene_videos)} 场景视频 + {len(character_images) if character_images else 0} 角色图像")
             
+            # 字幕解析在后台线程中进行，与下面的FFmpeg开场视频/拼接重叠（已传入段落时跳过SRT解析）
+            subtitle_future = None
+            if subtitle_segments is not None:
+                subtitle_future = asyncio.get_running_loop().create_future()
+                subtitle_future.set_result(subtitle_segments)
+            elif subtitle_file and Path(subtitle_file).exists():
+                subtitle_future = asyncio.get_running_loop().run_in_executor(
+                    None, self._parse_subtitle_file, subtitle_file)
+            
             # 准备所有视频片段列表
             all_video_segments = []
             
@@ -587,22 +1476,11 @@ class VideoComposer:
             concat_video = temp_dir / "concatenated_video.mp4"
             await self._concatenate_videos(all_video_segments, concat_video)
             
-            # 4. 添加音频轨道
-            if audio_file and Path(audio_file).exists():
-                video_with_audio = temp_dir / "video_with_audio.mp4"
-                await self._add_audio_track(concat_video, audio_file, video_with_audio)
-            else:
-                video_with_audio = concat_video
-            
-            # 5. 添加字幕
-            if subtitle_file and Path(subtitle_file).exists():
-                await self._apply_subtitles_to_video(
-                    video_with_audio, subtitle_file, output_path, use_jianying_style
-                )
-            else:
-                # 无字幕，直接复制最终视频
-                import shutil
-                shutil.copy2(video_with_audio, output_path)
+            # 4-5. 添加音频轨道与字幕
+            await self._finalize_video(
+                concat_video, audio_file, subtitle_future, output_path, temp_dir,
+                use_jianying_style, audio_duration
+            )
             
             self.logger.info(f"🎉 一体化模式视频合成完成: {output_path}")
             return str(output_path)
@@ -620,25 +1498,23 @@ class VideoComposer:
             
             # 使用FFmpeg从图像创建短视频
             cmd = [
-                'ffmpeg', '-y',
+                self.ffmpeg, '-y',
                 '-loop', '1', '-i', str(character_image_path),
                 '-t', str(duration),
                 '-vf', 'scale=720:1280:force_original_aspect_ratio=decrease,pad=720:1280:(ow-iw)/2:(oh-ih)/2:black',
                 '-pix_fmt', 'yuv420p',
                 '-r', '30',
+                '-threads', str(self.encode_threads),
                 str(character_video)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await result.communicate()
+            returncode, stderr = await self._run_ffmpeg(cmd)
             
-            if result.returncode == 0 and character_video.exists():
+            if returncode == 0:
                 self.logger.info(f"角色开场视频创建成功: {character_video}")
                 return character_video
             else:
-                self.logger.error(f"角色开场视频创建失败: {stderr.decode()}")
+                self.logger.error(f"角色开场视频创建失败: {stderr}")
                 return None
                 
         except Exception as e:
@@ -647,38 +1523,30 @@ class VideoComposer:
     
     async def _concatenate_videos(self, video_list, output_path):
         """
-        拼接多个视频文件
+        拼接多个视频文件（video_list中的文件需已确认存在）
         """
         try:
             # 创建FFmpeg concat文件
             concat_file = output_path.parent / f"concat_{output_path.stem}.txt"
             
-            with open(concat_file, 'w', encoding='utf-8') as f:
-                for video_path in video_list:
-                    # 确保使用绝对路径
-                    abs_path = Path(video_path).resolve()
-                    # 检查文件是否存在
-                    if not abs_path.exists():
-                        self.logger.error(f"视频文件不存在: {abs_path}")
-                        continue
-                    # 转义路径中的特殊字符
-                    escaped_path = str(abs_path).replace("'", "\\'").replace("\\", "\\\\")
-                    f.write(f"file '{escaped_path}'\n")
-                    self.logger.debug(f"添加到concat文件: {escaped_path}")
+            # 在内存中构建列表，只写一次文件
+            # 调用方已确认文件存在：这里只转换为绝对路径（不再逐个stat）
+            lines = [self._concat_entry(os.path.abspath(video_path)) for video_path in video_list]
             
             # 检查concat文件是否有有效内容
-            if not concat_file.exists() or concat_file.stat().st_size == 0:
+            if not lines:
                 self.logger.error("concat文件为空或不存在")
                 raise RuntimeError("没有有效的视频文件可以拼接")
             
+            concat_content = ''.join(lines)
+            concat_file.write_text(concat_content, encoding='utf-8')
             # 记录concat文件内容用于调试
-            with open(concat_file, 'r', encoding='utf-8') as f:
-                concat_content = f.read()
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"concat文件内容:\n{concat_content}")
             
             # 使用FFmpeg concat协议拼接视频
             cmd = [
-                'ffmpeg', '-y',
+                self.ffmpeg, '-y',
                 '-f', 'concat',
                 '-safe', '0',
                 '-i', str(concat_file),
@@ -686,73 +1554,124 @@ class VideoComposer:
                 str(output_path)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await result.communicate()
+            returncode, stderr = await self._run_ffmpeg(cmd)
             
-            if result.returncode == 0 and output_path.exists():
+            if returncode == 0:
                 self.logger.info(f"视频拼接完成: {output_path}")
                 # 清理临时concat文件
                 concat_file.unlink(missing_ok=True)
             else:
-                self.logger.error(f"视频拼接失败: {stderr.decode()}")
+                self.logger.error(f"视频拼接失败: {stderr}")
                 raise RuntimeError("视频拼接失败")
                 
         except Exception as e:
             self.logger.error(f"视频拼接时出错: {e}")
             raise
     
+    async def _finalize_video(self, video_path, audio_file, subtitle_future, output_path, temp_dir,
+                              use_jianying_style, video_duration=None):
+        """
+        为拼接好的视频添加音频轨道和字幕
+        
+        剪映风格字幕可生成ass滤镜时，音频合成与字幕烧录在同一次FFmpeg调用中完成（视频只编码一次）；
+        否则（或单次调用失败时）依次添加音频、渲染字幕
+        
+        Args:
+            subtitle_future: 后台解析字幕段落的future，无字幕时为None
+        """
+        has_audio = bool(audio_file and Path(audio_file).exists())
+        subtitle_segments = await subtitle_future if subtitle_future is not None else None
+        
+        if subtitle_segments and use_jianying_style:
+            # ASS脚本在线程池中写出（含字体检测），不阻塞事件循环
+            prepared = await asyncio.get_running_loop().run_in_executor(
+                None, self.subtitle_engine.create_subtitle_filter,
+                subtitle_segments, 'jianying', 'jianying', video_duration)
+            if prepared is not None:
+                subtitle_filter, ass_file = prepared
+                try:
+                    cmd = [self.ffmpeg, '-y', '-i', str(video_path)]
+                    if has_audio:
+                        cmd += ['-i', str(audio_file)]
+                    cmd += ['-filter_complex', f"[0:v]{subtitle_filter}[vout]", '-map', '[vout]']
+                    if has_audio:
+                        cmd += ['-map', '1:a', *await self._audio_codec_args(audio_file), '-shortest']
+                    output_args = ['-pix_fmt', 'yuv420p', *self._mp4_output_args(), str(output_path)]
+                    
+                    returncode, stderr = await self._run_encode(
+                        lambda encoder_args: [*cmd, *encoder_args, *output_args])
+                finally:
+                    Path(ass_file).unlink(missing_ok=True)
+                if returncode == 0:
+                    self.logger.info("✅ 音频与字幕已在单次编码中完成")
+                    return
+                self.logger.warning(f"音频与字幕单次合成失败，改为分步处理: {stderr}")
+        
+        # 分步处理：添加音频轨道 → 添加字幕
+        if has_audio:
+            video_with_audio = temp_dir / "video_with_audio.mp4"
+            await self._add_audio_track(video_path, audio_file, video_with_audio)
+        else:
+            video_with_audio = video_path
+        
+        if subtitle_segments is not None:
+            await self._apply_subtitles_to_video(
+                video_with_audio, subtitle_segments, output_path, use_jianying_style
+            )
+        else:
+            # 无字幕，直接使用最终视频
+            self._fast_copy(video_with_audio, output_path)
+    
+    def _parse_subtitle_file(self, subtitle_file) -> list:
+        """解析SRT字幕文件为字幕段落（不修改合成器状态，可在线程池中执行）"""
+        return self._load_subtitles_from_srt(subtitle_file)
+    
     async def _add_audio_track(self, video_path, audio_path, output_path):
         """
         为视频添加音频轨道
         """
         try:
             cmd = [
-                'ffmpeg', '-y',
+                self.ffmpeg, '-y',
                 '-i', str(video_path),
                 '-i', str(audio_path),
                 '-c:v', 'copy',  # 视频流直接复制
-                '-c:a', 'aac',   # 音频重新编码为AAC
+                *await self._audio_codec_args(audio_path),  # 已是AAC时直接复制，否则编码为AAC
                 '-shortest',     # 以较短的流为准
+                *self._mp4_output_args(),
                 str(output_path)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await result.communicate()
+            returncode, stderr = await self._run_ffmpeg(cmd)
             
-            if result.returncode == 0 and output_path.exists():
+            if returncode == 0:
                 self.logger.info(f"音频轨道添加完成: {output_path}")
             else:
-                self.logger.error(f"音频轨道添加失败: {stderr.decode()}")
+                self.logger.error(f"音频轨道添加失败: {stderr}")
                 raise RuntimeError("音频轨道添加失败")
                 
         except Exception as e:
             self.logger.error(f"添加音频轨道时出错: {e}")
             raise
     
-    async def _apply_subtitles_to_video(self, video_path, subtitle_file, output_path, use_jianying_style):
+    async def _apply_subtitles_to_video(self, video_path, subtitle_segments, output_path, use_jianying_style):
         """
-        为视频应用字幕
+        为视频应用字幕（字幕段落已由调用方解析）
         """
         try:
-            # 读取字幕文件
-            subtitle_segments = self._parse_subtitle_file(subtitle_file)
-            
             if not subtitle_segments:
                 self.logger.warning("字幕文件为空，跳过字幕渲染")
-                import shutil
-                shutil.copy2(video_path, output_path)
+                self._fast_copy(video_path, output_path)
                 return
             
             # 选择渲染风格
             renderer_name = 'jianying' if use_jianying_style else 'traditional'
             style_name = 'jianying' if use_jianying_style else 'main'
             
-            # 使用统一引擎渲染
-            success = self.subtitle_engine.render_to_video(
+            # 使用统一引擎渲染（阻塞的FFmpeg调用放到线程池，避免卡住事件循环）
+            success = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.subtitle_engine.render_to_video,
                 str(video_path),
                 subtitle_segments,
                 str(output_path),
@@ -765,11 +1684,9 @@ class VideoComposer:
             else:
                 self.logger.error(f"❌ 字幕渲染失败，使用{renderer_name}渲染器")
                 # 无字幕版本作为备选
-                import shutil
-                shutil.copy2(video_path, output_path)
+                self._fast_copy(video_path, output_path)
                 
         except Exception as e:
             self.logger.error(f"应用字幕时出错: {e}")
             # 无字幕版本作为备选
-            import shutil
-            shutil.copy2(video_path, output_path)
\ No newline at end of file
+            self._fast_copy(video_path, output_path)
\ No newline at end of file